@@ -0,0 +1,178 @@
+"""Benchmarks of the integration against the offline mock panel.
+
+Every benchmark sets a config entry up against a fresh mock panel on localhost
+and reports, for 10, 100 and 1000 servers:
+
+- the time ``async_setup_entry`` takes, with the client api only and with an
+  application api key,
+- the requests and duration of a refresh cycle,
+- the memory the integration holds per server once it is set up,
+- the state writes per minute with the default options.
+
+Run them from the root of the repository:
+
+    pip install -r benchmarks/requirements.txt
+    pytest -c benchmarks/pytest.ini benchmarks -s
+
+The write rate is measured in real time over ``BENCHMARK_WINDOW`` seconds (60
+by default), so that benchmark takes a few minutes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+import os
+import time
+import tracemalloc
+from typing import Any, Final
+
+from aiohttp import web
+import pytest
+from homeassistant.const import CONF_API_KEY, CONF_HOST, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pterodactyl_panel.const import CONF_APPLICATION_API_KEY, DOMAIN
+
+from .mock_panel import APPLICATION_API_KEY, CLIENT_API_KEY, MockPanel
+
+SERVER_COUNTS: Final = (10, 100, 1000)
+WINDOW: Final = float(os.environ.get("BENCHMARK_WINDOW", 60))
+LATENCY: Final = float(os.environ.get("BENCHMARK_LATENCY", 0.02))
+
+# Panels this big need more than the default request budget of one api key.
+OPTIONS: Final = {"requests_per_minute": 6000, "max_concurrent_requests": 20}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Let the test instance load the integration from custom_components."""
+
+
+@pytest.fixture
+async def panel(
+    request: pytest.FixtureRequest, socket_enabled: None
+) -> AsyncIterator[tuple[MockPanel, str]]:
+    """Serve a mock panel with the parametrized number of servers."""
+    mock_panel = MockPanel(
+        servers=request.param, nodes=max(request.param // 50, 1), latency=LATENCY
+    )
+    runner = web.AppRunner(mock_panel.application())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+
+    yield mock_panel, f"http://{host}:{port}"
+
+    await runner.cleanup()
+
+
+async def _async_setup_entry(
+    hass: HomeAssistant, url: str, application: bool = False
+) -> MockConfigEntry:
+    """Add and set up a config entry for the mock panel."""
+    data: dict[str, Any] = {CONF_HOST: url, CONF_API_KEY: CLIENT_API_KEY}
+    if application:
+        data[CONF_APPLICATION_API_KEY] = APPLICATION_API_KEY
+
+    entry = MockConfigEntry(domain=DOMAIN, data=data, options=OPTIONS, unique_id=url)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _report(name: str, servers: int, **results: Any) -> None:
+    """Print the results of a benchmark on one line."""
+    values = ", ".join(
+        f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in results.items()
+    )
+    print(f"\n[{name}] servers={servers}: {values}")  # noqa: T201
+
+
+@pytest.mark.parametrize("application", [False, True], ids=["client", "application"])
+@pytest.mark.parametrize("panel", SERVER_COUNTS, indirect=True)
+async def bench_setup_entry(
+    hass: HomeAssistant, panel: tuple[MockPanel, str], application: bool
+) -> None:
+    """Measure the setup of an entry and the refresh cycle it starts with."""
+    mock_panel, url = panel
+
+    started = time.perf_counter()
+    entry = await _async_setup_entry(hass, url, application)
+    elapsed = time.perf_counter() - started
+
+    metrics = entry.runtime_data.metrics
+    _report(
+        "setup",
+        mock_panel.servers,
+        api="application" if application else "client",
+        seconds=elapsed,
+        requests=mock_panel.total_requests,
+        first_cycle_seconds=metrics.last_cycle_duration,
+        entities=len(hass.states.async_all()),
+    )
+    assert len(entry.runtime_data.servers) == mock_panel.servers
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize("panel", SERVER_COUNTS, indirect=True)
+async def bench_memory(hass: HomeAssistant, panel: tuple[MockPanel, str]) -> None:
+    """Measure the memory the integration holds per server after its setup.
+
+    The modules imported by the first setup are counted as well, which mostly
+    shows at 10 servers.
+    """
+    mock_panel, url = panel
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        entry = await _async_setup_entry(hass, url)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    _report(
+        "memory",
+        mock_panel.servers,
+        bytes_per_server=(after - before) // mock_panel.servers,
+        peak_bytes_per_server=(peak - before) // mock_panel.servers,
+    )
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize("panel", SERVER_COUNTS, indirect=True)
+async def bench_steady_state(hass: HomeAssistant, panel: tuple[MockPanel, str]) -> None:
+    """Measure refresh cycles and state writes once the entry runs."""
+    mock_panel, url = panel
+    entry = await _async_setup_entry(hass, url)
+    metrics = entry.runtime_data.metrics
+
+    writes = 0
+
+    @callback
+    def _count_write(event: Event) -> None:
+        nonlocal writes
+        writes += 1
+
+    requests, cycles = metrics.requests, metrics.cycles.count
+    cycle_time = metrics.cycles.total
+    unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+    await asyncio.sleep(WINDOW)
+    await hass.async_block_till_done()
+    unsubscribe()
+
+    window_cycles = metrics.cycles.count - cycles
+    _report(
+        "steady state",
+        mock_panel.servers,
+        cycles=window_cycles,
+        requests_per_cycle=(metrics.requests - requests) / max(window_cycles, 1),
+        cycle_seconds=(metrics.cycles.total - cycle_time) / max(window_cycles, 1),
+        writes_per_minute=writes * 60 / WINDOW,
+    )
+    assert await hass.config_entries.async_unload(entry.entry_id)
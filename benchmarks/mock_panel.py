@@ -0,0 +1,356 @@
+"""Offline mock of the Pterodactyl Panel client and application apis.
+
+The mock serves a configurable number of simulated servers spread over a few
+nodes, with paginated listings, per request latency, injected 401 and 429
+responses and websocket stats. It counts every request it answers so a
+benchmark can compare what the integration sent with what the panel saw.
+
+Run it on its own to point a development instance of Home Assistant at it:
+
+    python -m benchmarks.mock_panel --servers 100 --port 8080
+
+Both api keys are accepted, any other key is answered with a 401.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import json
+import math
+import random
+import time
+from typing import Any, Final
+
+from aiohttp import WSMsgType, web
+
+CLIENT_API_KEY: Final = "ptlc_benchmark"
+APPLICATION_API_KEY: Final = "ptla_benchmark"
+
+# The page sizes of the panel: 50 by default, at most 100 when asked for.
+DEFAULT_PAGE_SIZE: Final = 50
+MAX_PAGE_SIZE: Final = 100
+
+MEBIBYTE: Final = 1024 * 1024
+STATS_INTERVAL: Final = 2
+
+
+@dataclass(slots=True)
+class MockServer:
+    """A simulated server and its resource counters."""
+
+    id: int
+    identifier: str
+    name: str
+    node: int
+    state: str
+    started: float
+    memory: int
+    disk: int
+    cpu: float = 0.0
+    network_rx: int = 0
+    network_tx: int = 0
+
+    def advance(self, rng: random.Random) -> None:
+        """Move the counters on as if some time passed."""
+        if self.state != "running":
+            self.cpu = 0.0
+            return
+        self.cpu = round(max(0.0, self.cpu + rng.uniform(-5, 5)), 3)
+        self.memory = max(MEBIBYTE, self.memory + rng.randint(-4, 4) * MEBIBYTE)
+        self.network_rx += rng.randint(0, 64 * 1024)
+        self.network_tx += rng.randint(0, 64 * 1024)
+
+    def resources(self) -> dict[str, Any]:
+        """Return the resources in the shape of the client api."""
+        running = self.state == "running"
+        return {
+            "memory_bytes": self.memory if running else 0,
+            "cpu_absolute": self.cpu,
+            "disk_bytes": self.disk,
+            "network_rx_bytes": self.network_rx if running else 0,
+            "network_tx_bytes": self.network_tx if running else 0,
+            "uptime": int((time.time() - self.started) * 1000) if running else 0,
+        }
+
+
+@dataclass
+class MockPanel:
+    """State and behaviour of the simulated panel."""
+
+    servers: int = 10
+    nodes: int = 2
+    latency: float = 0.0
+    jitter: float = 0.0
+    unauthorized_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 1
+    seed: int = 0
+    requests: Counter[str] = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        """Create the simulated servers."""
+        self._rng = random.Random(self.seed)
+        now = time.time()
+        self._servers: dict[str, MockServer] = {}
+        for index in range(self.servers):
+            identifier = f"{index:08x}"
+            self._servers[identifier] = MockServer(
+                id=index + 1,
+                identifier=identifier,
+                name=f"server-{index}",
+                node=index % self.nodes + 1,
+                state="running" if self._rng.random() < 0.8 else "offline",
+                started=now - self._rng.randint(60, 86400),
+                memory=self._rng.randint(256, 4096) * MEBIBYTE,
+                disk=self._rng.randint(1024, 20480) * MEBIBYTE,
+            )
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests answered so far."""
+        return sum(self.requests.values())
+
+    def application(self) -> web.Application:
+        """Return the aiohttp application serving the panel."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/client", self._list_servers)
+        app.router.add_get("/api/client/account", self._account)
+        app.router.add_get("/api/client/servers/{server}", self._server)
+        app.router.add_get("/api/client/servers/{server}/resources", self._resources)
+        app.router.add_post("/api/client/servers/{server}/power", self._power)
+        app.router.add_get("/api/client/servers/{server}/websocket", self._websocket)
+        app.router.add_get("/api/application/nodes", self._application_nodes)
+        app.router.add_get("/api/application/servers", self._application_servers)
+        app.router.add_get("/ws/{server}", self._socket)
+        return app
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Apply latency, authentication and injected errors to every request."""
+        if request.path.startswith("/ws/"):
+            return await handler(request)
+
+        self.requests[request.method + " " + _route(request)] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+
+        expected = (
+            APPLICATION_API_KEY
+            if request.path.startswith("/api/application")
+            else CLIENT_API_KEY
+        )
+        if (
+            request.headers.get("Authorization") != f"Bearer {expected}"
+            or self._rng.random() < self.unauthorized_rate
+        ):
+            return _error(401, "InvalidCredentialsException")
+        if self._rng.random() < self.throttle_rate:
+            response = _error(429, "TooManyRequestsHttpException")
+            response.headers["Retry-After"] = str(self.retry_after)
+            return response
+
+        return await handler(request)
+
+    def _get_server(self, request: web.Request) -> MockServer:
+        """Return the server of the request or raise a 404."""
+        try:
+            return self._servers[request.match_info["server"]]
+        except KeyError:
+            raise web.HTTPNotFound from None
+
+    async def _account(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "object": "user",
+                "attributes": {"id": 1, "admin": True, "username": "benchmark"},
+            }
+        )
+
+    async def _list_servers(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            _page(request, list(self._servers.values()), self._client_server)
+        )
+
+    async def _server(self, request: web.Request) -> web.Response:
+        server = self._client_server(self._get_server(request))
+        return web.json_response({"object": "server", "attributes": server})
+
+    async def _resources(self, request: web.Request) -> web.Response:
+        server = self._get_server(request)
+        server.advance(self._rng)
+        return web.json_response(
+            {
+                "object": "stats",
+                "attributes": {
+                    "current_state": server.state,
+                    "is_suspended": False,
+                    "resources": server.resources(),
+                },
+            }
+        )
+
+    async def _power(self, request: web.Request) -> web.Response:
+        server = self._get_server(request)
+        signal = (await request.json())["signal"]
+        if signal in ("stop", "kill"):
+            server.state = "offline"
+        else:
+            server.state = "running"
+            server.started = time.time()
+        return web.Response(status=204)
+
+    async def _websocket(self, request: web.Request) -> web.Response:
+        server = self._get_server(request)
+        socket = f"ws://{request.host}/ws/{server.identifier}"
+        return web.json_response(
+            {"data": {"token": f"token-{server.identifier}", "socket": socket}}
+        )
+
+    async def _socket(self, request: web.Request) -> web.WebSocketResponse:
+        """Stream the stats of a server once the socket is authenticated."""
+        server = self._get_server(request)
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        streamer: asyncio.Task[None] | None = None
+
+        try:
+            async for message in socket:
+                if message.type is not WSMsgType.TEXT:
+                    break
+                event = message.json().get("event")
+                if event == "auth" and streamer is None:
+                    await socket.send_json({"event": "auth success"})
+                    await socket.send_json({"event": "status", "args": [server.state]})
+                    streamer = asyncio.create_task(self._stream(socket, server))
+        finally:
+            if streamer is not None:
+                streamer.cancel()
+
+        return socket
+
+    async def _stream(self, socket: web.WebSocketResponse, server: MockServer) -> None:
+        """Send the stats of a server until the socket closes."""
+        while not socket.closed:
+            server.advance(self._rng)
+            resources = server.resources()
+            stats = {
+                "state": server.state,
+                "memory_bytes": resources["memory_bytes"],
+                "cpu_absolute": resources["cpu_absolute"],
+                "disk_bytes": resources["disk_bytes"],
+                "network": {
+                    "rx_bytes": resources["network_rx_bytes"],
+                    "tx_bytes": resources["network_tx_bytes"],
+                },
+                "uptime": resources["uptime"],
+            }
+            await socket.send_json({"event": "stats", "args": [json.dumps(stats)]})
+            await asyncio.sleep(STATS_INTERVAL)
+
+    async def _application_nodes(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            _page(request, list(range(1, self.nodes + 1)), self._application_node)
+        )
+
+    async def _application_servers(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            _page(request, list(self._servers.values()), self._application_server)
+        )
+
+    def _client_server(self, server: MockServer) -> dict[str, Any]:
+        return {
+            "identifier": server.identifier,
+            "name": server.name,
+            "node": f"node-{server.node}",
+            "docker_image": "ghcr.io/pterodactyl/yolks:java_17",
+            "is_node_under_maintenance": False,
+            "is_suspended": False,
+            "limits": {"memory": 4096, "disk": 20480, "cpu": 200},
+        }
+
+    def _application_server(self, server: MockServer) -> dict[str, Any]:
+        return {
+            "id": server.id,
+            "identifier": server.identifier,
+            "name": server.name,
+            "node": server.node,
+            "suspended": False,
+            "limits": {"memory": 4096, "disk": 20480, "cpu": 200},
+            "container": {"image": "ghcr.io/pterodactyl/yolks:java_17"},
+        }
+
+    def _application_node(self, node: int) -> dict[str, Any]:
+        return {
+            "id": node,
+            "name": f"node-{node}",
+            "maintenance_mode": False,
+            "memory": 65536,
+            "disk": 1048576,
+        }
+
+
+def _route(request: web.Request) -> str:
+    """Return the route of a request with the server id left out."""
+    resource = request.match_info.route.resource
+    return resource.canonical if resource is not None else request.path
+
+
+def _error(status: int, code: str) -> web.Response:
+    return web.json_response(
+        {"errors": [{"code": code, "status": str(status), "detail": code}]},
+        status=status,
+    )
+
+
+def _page(request: web.Request, items: list[Any], render: Any) -> dict[str, Any]:
+    """Return one page of a listing with the pagination meta of the panel."""
+    per_page = min(int(request.query.get("per_page", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    page = max(int(request.query.get("page", 1)), 1)
+    total_pages = max(math.ceil(len(items) / per_page), 1)
+    chunk = items[(page - 1) * per_page : page * per_page]
+    return {
+        "object": "list",
+        "data": [{"object": "item", "attributes": render(item)} for item in chunk],
+        "meta": {
+            "pagination": {
+                "total": len(items),
+                "count": len(chunk),
+                "per_page": per_page,
+                "current_page": page,
+                "total_pages": total_pages,
+            }
+        },
+    }
+
+
+def main() -> None:
+    """Serve the mock panel until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=10)
+    parser.add_argument("--nodes", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    panel = MockPanel(
+        servers=args.servers,
+        nodes=args.nodes,
+        latency=args.latency,
+        jitter=args.jitter,
+        unauthorized_rate=args.unauthorized_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    web.run_app(panel.application(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,41 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Final
 
-from pydactyl import PterodactylClient
-from pydactyl.exceptions import ClientConfigError
-from pydactyl.responses import PaginatedResponse
-from requests.exceptions import HTTPError
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, CONF_HOST, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-
-from .const import DOMAIN, PTERODACTYL_ATTRIBUTES
-from .coordinator import PterodactylServerCoordinator
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .api import (
+    PterodactylApiClient,
+    PterodactylApiError,
+    PterodactylApplicationApiClient,
+    PterodactylAuthError,
+    account_unique_id,
+)
+from .const import (
+    CONF_APPLICATION_API_KEY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MONITORED_SERVERS,
+    CONF_NAME_FILTER,
+    CONF_NODE_FILTER,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_REQUEST_TIMEOUT,
+    DOMAIN,
+)
+from .coordinator import STORAGE_VERSION, PterodactylPanelCoordinator, storage_key
+from .metrics import PanelMetrics
+from .pool import async_get_pool
+from .services import async_setup_services
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
@@ -24,6 +45,49 @@ PLATFORMS: Final[list[str]] = [Platform.BINARY_SENSOR, Platform.BUTTON, Platform
 
 STARTUP_MESSAGE: Final = f"Starting setup for {DOMAIN}"
 
+SERVER_SELECTION_OPTIONS: Final = {
+    CONF_MONITORED_SERVERS,
+    CONF_NAME_FILTER,
+    CONF_NODE_FILTER,
+}
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Pterodactyl Panel services."""
+    async_setup_services(hass)
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if config_entry.version > 1:
+        # The entry was set up by a newer version of the integration.
+        return False
+
+    if config_entry.minor_version < 2:
+        # The unique id was the host alone, add the account that owns the key.
+        url = config_entry.data[CONF_HOST]
+        api_key = config_entry.data[CONF_API_KEY]
+        pool = async_get_pool(hass)
+        client = pool.client(PterodactylApiClient, url, api_key)
+        try:
+            account = await client.get_account()
+        except PterodactylApiError as exception:
+            # Keep the entry as it is, the migration is retried on its next setup.
+            _LOGGER.debug("Could not migrate the entry of %s: %s", url, exception)
+            return True
+        pool.mark_validated(url, api_key)
+        hass.config_entries.async_update_entry(
+            config_entry,
+            unique_id=account_unique_id(url, account),
+            minor_version=2,
+        )
+        _LOGGER.debug("Migrated the entry of %s to version 1.2", url)
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up Pterodactyl Panel from a config entry."""
@@ -31,53 +95,119 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         hass.data.setdefault(DOMAIN, {})
         _LOGGER.info(STARTUP_MESSAGE)
 
+    setup_start = time.monotonic()
     url = config_entry.data.get(CONF_HOST)
     api_key = config_entry.data.get(CONF_API_KEY)
 
-    try:
-        pterodactyl_api = PterodactylClient(url, api_key)
-        await hass.async_add_executor_job(pterodactyl_api.client.account.get_account)
-    except ClientConfigError as exception:
-        raise ConfigEntryAuthFailed from exception
-    except HTTPError as exception:
-        if exception.response.status_code == 401:
-                raise ConfigEntryAuthFailed from exception
-
-        raise ConfigEntryNotReady from exception
-
-    coordinators: list[PterodactylServerCoordinator] = []
-
-    server_list_pages: PaginatedResponse = await hass.async_add_executor_job(
-        pterodactyl_api.client.servers.list_servers
+    client_options = {
+        "max_concurrent_requests": config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        "requests_per_minute": config_entry.options.get(
+            CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE
+        ),
+        "request_timeout": config_entry.options.get(
+            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+        ),
+        # Both apis count towards the metrics of the entry.
+        "metrics": PanelMetrics(),
+    }
+
+    # Entries of the same panel share connections and the request budget.
+    pool = async_get_pool(hass)
+    pterodactyl_api = pool.client(
+        PterodactylApiClient,
+        url,
+        api_key,
+        entry_id=config_entry.entry_id,
+        **client_options,
     )
-    server_list_data = server_list_pages.data
 
-    # Get all servers if more than one page.
-    if server_list_pages.meta['pagination']['total_pages'] > 1:
-        server_list_data = await hass.async_add_executor_job(server_list_pages.collect)
+    application_api = None
+    if application_api_key := config_entry.data.get(CONF_APPLICATION_API_KEY):
+        application_api = pool.client(
+            PterodactylApplicationApiClient,
+            url,
+            application_api_key,
+            entry_id=config_entry.entry_id,
+            **client_options,
+        )
 
-    servers = [server_data[PTERODACTYL_ATTRIBUTES] for server_data in server_list_data]
+    coordinator = PterodactylPanelCoordinator(
+        hass=hass,
+        entry=config_entry,
+        client=pterodactyl_api,
+        application_client=application_api,
+    )
 
-    for server in servers:
-        coordinator_server = PterodactylServerCoordinator(
-            hass=hass, entry=config_entry, client=pterodactyl_api, server=server
+    if await coordinator.async_restore():
+        # Entities start from the cache, catch up with the panel in the background.
+        config_entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} reconcile {url}"
         )
-        await coordinator_server.async_refresh()
-        coordinators.append(coordinator_server)
-
-    config_entry.runtime_data = coordinators
+    else:
+        try:
+            # Skip the account request if the key was just checked, e.g. by the
+            # config flow or a setup before a reload.
+            if not pool.is_validated(url, api_key):
+                await pterodactyl_api.get_account()
+                pool.mark_validated(url, api_key)
+            coordinator.async_update_servers(await coordinator.async_list_servers())
+        except PterodactylAuthError as exception:
+            pool.forget_validation(url, api_key)
+            raise ConfigEntryAuthFailed from exception
+        except PterodactylApiError as exception:
+            raise ConfigEntryNotReady from exception
+
+        await coordinator.async_config_entry_first_refresh()
+
+    config_entry.runtime_data = coordinator
+    config_entry.async_on_unload(config_entry.add_update_listener(async_update_options))
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    coordinator.async_remove_stale_devices()
+
+    _LOGGER.info(
+        "Set up %s with %d servers in %.2f seconds",
+        url,
+        len(coordinator.servers),
+        time.monotonic() - setup_start,
+    )
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        async_get_pool(hass).release(entry.data[CONF_HOST], entry.entry_id)
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cache of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry.entry_id)).async_remove()
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reloading the entry unless only servers changed."""
+    coordinator: PterodactylPanelCoordinator = entry.runtime_data
+    changed = {
+        key
+        for key in entry.options.keys() | coordinator.applied_options.keys()
+        if entry.options.get(key) != coordinator.applied_options.get(key)
+    }
+
+    if changed <= SERVER_SELECTION_OPTIONS:
+        # The inventory is already known, only add or remove the affected servers.
+        coordinator.applied_options = dict(entry.options)
+        coordinator.async_apply_server_selection()
+        await coordinator.async_request_refresh()
+        return
+
+    await async_reload_entry(hass, entry)
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
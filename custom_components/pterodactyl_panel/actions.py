@@ -0,0 +1,86 @@
+"""Power action tracking for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+# The state each power action settles in.
+POWER_ACTION_STATES: Final = {
+    "start": "running",
+    "restart": "running",
+    "stop": "offline",
+    "kill": "offline",
+}
+
+# The state shown while the panel has not caught up with an action yet.
+POWER_ACTION_TRANSITIONS: Final = {
+    "start": "starting",
+    "restart": "stopping",
+    "stop": "stopping",
+    "kill": "stopping",
+}
+
+# Repeating an action within this many seconds is ignored.
+ACTION_DEDUP_WINDOW: Final = 15
+# Seconds between follow-up polls and how long they follow a server at most.
+FOLLOW_UP_INTERVAL: Final = 3
+FOLLOW_UP_TIMEOUT: Final = 120
+
+
+@dataclass(slots=True)
+class PendingPowerAction:
+    """A power action whose state the panel has not reported yet."""
+
+    action: str
+    sent: float
+    # A restart has to leave the running state before it can settle.
+    left_target: bool
+
+
+class PowerActionTracker:
+    """Track the power actions that are in flight, one per server."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker without pending actions."""
+        self._pending: dict[str, PendingPowerAction] = {}
+
+    def get(self, server_id: str) -> PendingPowerAction | None:
+        """Return the pending action of a server, if any."""
+        return self._pending.get(server_id)
+
+    def is_duplicate(self, server_id: str, action: str, now: float) -> bool:
+        """Return if the same action was just sent to the server."""
+        pending = self._pending.get(server_id)
+        return (
+            pending is not None
+            and pending.action == action
+            and now - pending.sent < ACTION_DEDUP_WINDOW
+        )
+
+    def start(self, server_id: str, action: str, now: float) -> None:
+        """Remember an action that is being sent to a server."""
+        self._pending[server_id] = PendingPowerAction(
+            action, now, left_target=action != "restart"
+        )
+
+    def settle(
+        self, server_id: str, state: str, now: float
+    ) -> PendingPowerAction | None:
+        """Observe the state of a server, returning its action while unsettled."""
+        if (pending := self._pending.get(server_id)) is None:
+            return None
+
+        target = POWER_ACTION_STATES[pending.action]
+        if state != target:
+            pending.left_target = True
+        if (
+            state == target and pending.left_target
+        ) or now - pending.sent >= FOLLOW_UP_TIMEOUT:
+            del self._pending[server_id]
+            return None
+        return pending
+
+    def remove(self, server_id: str) -> None:
+        """Forget the pending action of a server."""
+        self._pending.pop(server_id, None)
@@ -0,0 +1,397 @@
+"""Async clients for the Pterodactyl Panel client and application APIs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+import logging
+import time
+from typing import Any, Final
+
+from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
+
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_REQUEST_TIMEOUT,
+    PTERODACTYL_ATTRIBUTES,
+    PTERODACTYL_DOCKER_IMAGE,
+    PTERODACTYL_ID,
+    PTERODACTYL_NAME,
+    PTERODACTYL_NODE,
+)
+from .metrics import PanelMetrics, endpoint_label
+from .scheduler import (
+    PRIORITY_ACTION,
+    PRIORITY_BACKGROUND,
+    PRIORITY_CONTROL,
+    PRIORITY_POLL,
+    RequestScheduler,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RETRY_AFTER: Final = 60
+RATE_LIMIT_RETRIES: Final = 2
+HEADER_REMAINING: Final = "X-RateLimit-Remaining"
+
+# The application api lets us ask for bigger pages than its default of 50.
+APPLICATION_PAGE_SIZE: Final = 100
+
+
+class PterodactylApiError(Exception):
+    """Error returned by the Pterodactyl Panel api."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Initialize the error with the HTTP status, if any."""
+        super().__init__(message)
+        self.status = status
+
+
+class PterodactylAuthError(PterodactylApiError):
+    """The api key was rejected by the Pterodactyl Panel."""
+
+
+class PterodactylConnectionError(PterodactylApiError):
+    """The Pterodactyl Panel could not be reached."""
+
+
+class PterodactylRateLimitError(PterodactylApiError):
+    """The Pterodactyl Panel kept throttling a request."""
+
+
+def _retry_after(headers: Mapping[str, str]) -> float:
+    """Return the seconds to wait after a throttled request."""
+    try:
+        return max(float(headers["Retry-After"]), 1)
+    except (KeyError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def normalize_url(url: str) -> str:
+    """Return the panel url with a scheme and without a trailing slash."""
+    if not url.startswith("http"):
+        url = f"https://{url}"
+    return url.rstrip("/")
+
+
+def account_unique_id(url: str, account: dict[str, Any]) -> str:
+    """Return the unique id of a config entry for an account of a panel."""
+    return f"{normalize_url(url)}_{account['id']}"
+
+
+def _application_allocation(
+    allocation: dict[str, Any], server: dict[str, Any]
+) -> dict[str, Any]:
+    """Map an application api allocation onto a client api allocation."""
+    return {
+        "object": "allocation",
+        PTERODACTYL_ATTRIBUTES: {
+            "id": allocation["id"],
+            "ip": allocation["ip"],
+            "ip_alias": allocation.get("alias"),
+            "port": allocation["port"],
+            "notes": allocation.get("notes"),
+            "is_default": allocation["id"] == server.get("allocation"),
+        },
+    }
+
+
+def _application_server(
+    server: dict[str, Any], node: dict[str, Any]
+) -> dict[str, Any]:
+    """Map an application api server and its node onto a client api server."""
+    # Keys without read access to allocations get no allocations at all.
+    relationships = server.get("relationships") or {}
+    allocations = (relationships.get("allocations") or {}).get("data", [])
+    return {
+        PTERODACTYL_ID: server["identifier"],
+        PTERODACTYL_NAME: server["name"],
+        PTERODACTYL_DOCKER_IMAGE: server["container"]["image"],
+        PTERODACTYL_NODE: node.get("name"),
+        "is_node_under_maintenance": node.get("maintenance_mode", False),
+        "node_memory": node.get("memory"),
+        "node_disk": node.get("disk"),
+        "is_suspended": server["suspended"],
+        "limits": server["limits"],
+        "relationships": {
+            "allocations": {
+                "object": "list",
+                "data": [
+                    _application_allocation(allocation[PTERODACTYL_ATTRIBUTES], server)
+                    for allocation in allocations
+                ],
+            }
+        },
+    }
+
+
+class _PterodactylApi:
+    """Shared request handling of the Pterodactyl Panel apis.
+
+    Requests share the given aiohttp session, so connections are pooled and kept
+    alive between refresh cycles. The number of requests in flight is capped and
+    every request has its own timeout.
+
+    Every request is admitted by the request scheduler of the client, which keeps
+    the api key, or every key of the same panel host, within the rate limit.
+    Throttled requests are retried after the delay the panel asks for.
+
+    The outcome, latency and waiting time of every request are recorded in the
+    panel metrics, which clients of the same config entry share.
+    """
+
+    api_path: str
+
+    def __init__(
+        self,
+        session: ClientSession,
+        url: str,
+        api_key: str,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        metrics: PanelMetrics | None = None,
+        scheduler: RequestScheduler | None = None,
+    ) -> None:
+        """Initialize the Pterodactyl Panel api client.
+
+        Clients of the same panel host may share a request scheduler, which
+        then replaces the budget of requests_per_minute.
+        """
+        self.url = normalize_url(url)
+        self.session = session
+        self._headers = {
+            "Accept": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        }
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._timeout = ClientTimeout(total=request_timeout)
+        self.scheduler = scheduler or RequestScheduler(requests_per_minute)
+        self.metrics = metrics or PanelMetrics()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        priority: int = PRIORITY_POLL,
+    ) -> dict[str, Any]:
+        """Send a request to the api and return the decoded response."""
+        url = f"{self.url}{self.api_path}{path}"
+        endpoint = self.metrics.endpoint(endpoint_label(method, self.api_path, path))
+
+        for _ in range(RATE_LIMIT_RETRIES + 1):
+            queued = time.monotonic()
+            await self.scheduler.acquire(priority)
+            admitted = time.monotonic()
+            self.metrics.scheduler_wait.observe(admitted - queued)
+
+            async with self._semaphore:
+                started = time.monotonic()
+                self.metrics.connection_wait.observe(started - admitted)
+                endpoint.requests += 1
+                try:
+                    async with self.session.request(
+                        method,
+                        url,
+                        params=params,
+                        json=json,
+                        headers=self._headers,
+                        timeout=self._timeout,
+                    ) as response:
+                        if response.status == 429:
+                            endpoint.throttled += 1
+                            self._throttled(path, response)
+                            continue
+                        return await self._async_read_response(path, response)
+                except PterodactylApiError:
+                    endpoint.errors += 1
+                    raise
+                except (ClientError, TimeoutError) as exception:
+                    endpoint.errors += 1
+                    raise PterodactylConnectionError(
+                        f"Error requesting {path}: {exception!r}"
+                    ) from exception
+                finally:
+                    endpoint.latency.observe(time.monotonic() - started)
+
+        raise PterodactylRateLimitError(f"Request to {path} was throttled", 429)
+
+    def _throttled(self, path: str, response: ClientResponse) -> None:
+        """Pause the scheduler for as long as the panel asks."""
+        retry_after = _retry_after(response.headers)
+        _LOGGER.debug(
+            "Request to %s throttled, retrying in %s seconds", path, retry_after
+        )
+        self.scheduler.pause(retry_after)
+
+    async def _async_read_response(
+        self, path: str, response: ClientResponse
+    ) -> dict[str, Any]:
+        """Return the decoded response, raising for error statuses."""
+        remaining = response.headers.get(HEADER_REMAINING)
+        if remaining is not None and remaining.isdigit():
+            self.scheduler.observe_remaining(int(remaining))
+
+        # A 403 only means the key may not access this resource, such as a
+        # server it has no permissions on, so only a 401 rejects the key.
+        if response.status == 401:
+            raise PterodactylAuthError(
+                f"Unauthorized request to {path}", response.status
+            )
+        if response.status >= 400:
+            raise PterodactylApiError(
+                f"Request to {path} failed with status {response.status}",
+                response.status,
+            )
+        if response.status == 204:
+            return {}
+        return await response.json()
+
+    async def _async_get_pages(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        priority: int = PRIORITY_POLL,
+    ) -> list[dict[str, Any]]:
+        """Return the items of every page of a paginated listing."""
+        params = params or {}
+        first_page = await self._request(
+            "GET", path, params={**params, "page": 1}, priority=priority
+        )
+        pages = [first_page]
+
+        # Get the remaining pages at once if there is more than one.
+        total_pages = first_page["meta"]["pagination"]["total_pages"]
+        if total_pages > 1:
+            pages.extend(
+                await asyncio.gather(
+                    *(
+                        self._request(
+                            "GET",
+                            path,
+                            params={**params, "page": page},
+                            priority=priority,
+                        )
+                        for page in range(2, total_pages + 1)
+                    )
+                )
+            )
+
+        return [item[PTERODACTYL_ATTRIBUTES] for page in pages for item in page["data"]]
+
+    async def _async_get_list(
+        self, path: str, priority: int = PRIORITY_POLL
+    ) -> list[dict[str, Any]]:
+        """Return the items of a listing that is not paginated."""
+        response = await self._request("GET", path, priority=priority)
+        return [item[PTERODACTYL_ATTRIBUTES] for item in response["data"]]
+
+
+class PterodactylApiClient(_PterodactylApi):
+    """Async Pterodactyl Panel client api."""
+
+    api_path = "/api/client"
+
+    async def get_account(self) -> dict[str, Any]:
+        """Return the account that owns the api key."""
+        response = await self._request("GET", "/account", priority=PRIORITY_CONTROL)
+        return response[PTERODACTYL_ATTRIBUTES]
+
+    async def list_servers(self) -> list[dict[str, Any]]:
+        """Return the attributes of every server, following all pages."""
+        return await self._async_get_pages("")
+
+    async def get_server(self, server_id: str) -> dict[str, Any]:
+        """Return the info of a server."""
+        response = await self._request("GET", f"/servers/{server_id}")
+        return response[PTERODACTYL_ATTRIBUTES]
+
+    async def get_server_utilization(self, server_id: str) -> dict[str, Any]:
+        """Return the current resource utilization of a server."""
+        response = await self._request("GET", f"/servers/{server_id}/resources")
+        return response[PTERODACTYL_ATTRIBUTES]
+
+    async def send_power_action(self, server_id: str, action: str) -> None:
+        """Send a power signal (start, stop, restart or kill) to a server."""
+        await self._request(
+            "POST",
+            f"/servers/{server_id}/power",
+            json={"signal": action},
+            priority=PRIORITY_ACTION,
+        )
+
+    async def list_backups(self, server_id: str) -> list[dict[str, Any]]:
+        """Return the backups of a server, following all pages."""
+        return await self._async_get_pages(
+            f"/servers/{server_id}/backups", priority=PRIORITY_BACKGROUND
+        )
+
+    async def create_backup(self, server_id: str) -> dict[str, Any]:
+        """Start a backup of a server and return it."""
+        response = await self._request(
+            "POST", f"/servers/{server_id}/backups", priority=PRIORITY_ACTION
+        )
+        return response[PTERODACTYL_ATTRIBUTES]
+
+    async def list_schedules(self, server_id: str) -> list[dict[str, Any]]:
+        """Return the schedules of a server."""
+        return await self._async_get_list(
+            f"/servers/{server_id}/schedules", priority=PRIORITY_BACKGROUND
+        )
+
+    async def list_databases(self, server_id: str) -> list[dict[str, Any]]:
+        """Return the databases of a server."""
+        return await self._async_get_list(
+            f"/servers/{server_id}/databases", priority=PRIORITY_BACKGROUND
+        )
+
+    async def list_allocations(self, server_id: str) -> list[dict[str, Any]]:
+        """Return the network allocations of a server."""
+        return await self._async_get_list(
+            f"/servers/{server_id}/network/allocations", priority=PRIORITY_BACKGROUND
+        )
+
+    async def get_websocket(self, server_id: str) -> dict[str, Any]:
+        """Return the websocket url and authentication token of a server."""
+        response = await self._request(
+            "GET", f"/servers/{server_id}/websocket", priority=PRIORITY_CONTROL
+        )
+        return response["data"]
+
+
+class PterodactylApplicationApiClient(_PterodactylApi):
+    """Async Pterodactyl Panel application api.
+
+    An application api key sees every server and node of the panel, so the whole
+    server list comes from a few paginated requests instead of one request per
+    server. It has a rate limit of its own, separate from the client api key.
+    """
+
+    api_path = "/api/application"
+
+    async def list_nodes(self) -> list[dict[str, Any]]:
+        """Return the attributes of every node, following all pages."""
+        return await self._async_get_pages(
+            "/nodes", params={"per_page": APPLICATION_PAGE_SIZE}
+        )
+
+    async def list_servers(self) -> list[dict[str, Any]]:
+        """Return every server in the shape of the client api server listing."""
+        # Nodes are listed once instead of being included with every server.
+        nodes, servers = await asyncio.gather(
+            self.list_nodes(),
+            self._async_get_pages(
+                "/servers",
+                params={"per_page": APPLICATION_PAGE_SIZE, "include": "allocations"},
+            ),
+        )
+        nodes_by_id = {node["id"]: node for node in nodes}
+
+        return [
+            _application_server(server, nodes_by_id.get(server["node"], {}))
+            for server in servers
+        ]
+
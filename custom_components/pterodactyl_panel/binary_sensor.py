@@ -1,6 +1,6 @@
 """Binary Sensor for the Pterodactyl Panel."""
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Final
 
@@ -10,7 +10,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .entity import PterodactylEntity, PterodactylEntityDescription
@@ -44,15 +44,26 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Pterodactyl Panel binary sensors."""
-    for coordinator in config_entry.runtime_data:
+    coordinator = config_entry.runtime_data
+
+    @callback
+    def _async_add_servers(server_ids: Iterable[str]) -> None:
+        """Add the binary sensors of the given servers."""
         async_add_entities(
             [
-                PterodactylBinarySensorEntity(coordinator, config_entry, sensor)
+                PterodactylBinarySensorEntity(
+                    coordinator, config_entry, server_id, sensor
+                )
+                for server_id in server_ids
                 for sensor in BINARY_SENSORS
-                if sensor.key in coordinator.data
             ]
         )
 
+    _async_add_servers(coordinator.servers)
+    config_entry.async_on_unload(
+        coordinator.async_add_servers_listener(_async_add_servers)
+    )
+
 
 class PterodactylBinarySensorEntity(PterodactylEntity, BinarySensorEntity):
     """Represents a Pterodactyl Panel binary sensor."""
@@ -60,5 +71,5 @@ class PterodactylBinarySensorEntity(PterodactylEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        val = self.coordinator.data.get(self.entity_description.key)
+        val = self.server_value(self.entity_description.key)
         return self.entity_description.value_fn(val)
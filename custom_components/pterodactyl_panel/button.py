@@ -1,12 +1,13 @@
 """Button for the Pterodactyl Panel."""
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 import logging
 from typing import Final
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -27,6 +28,11 @@ BUTTONS: Final[list[PterodactylButtonEntityDescription]] = [
         key="server_restart",
         translation_key="pterodactyl_server_restart",
     ),
+    PterodactylButtonEntityDescription(
+        key="server_backup",
+        translation_key="pterodactyl_server_backup",
+        entity_registry_enabled_default=False,
+    ),
 ]
 
 
@@ -36,14 +42,24 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Pterodactyl Panel buttons."""
-    for coordinator in config_entry.runtime_data:
+    coordinator = config_entry.runtime_data
+
+    @callback
+    def _async_add_servers(server_ids: Iterable[str]) -> None:
+        """Add the buttons of the given servers."""
         async_add_entities(
             [
-                PterodactylButtonEntity(coordinator, config_entry, button)
+                PterodactylButtonEntity(coordinator, config_entry, server_id, button)
+                for server_id in server_ids
                 for button in BUTTONS
             ]
         )
 
+    _async_add_servers(coordinator.servers)
+    config_entry.async_on_unload(
+        coordinator.async_add_servers_listener(_async_add_servers)
+    )
+
 
 class PterodactylButtonEntity(PterodactylEntity, ButtonEntity):
     """Represents a Pterodactyl Panel button."""
@@ -58,7 +74,10 @@ class PterodactylButtonEntity(PterodactylEntity, ButtonEntity):
                 power_action = "stop"
             case "server_restart":
                 power_action = "restart"
+            case "server_backup":
+                await self.coordinator.async_create_backup(self.server_id)
+                return
             case _:
                 raise ServiceValidationError("Button must be start, stop, or restart")
 
-        await self.coordinator.send_power_action(power_action)
+        await self.coordinator.send_power_action(self.server_id, power_action)
@@ -4,18 +4,103 @@ from __future__ import annotations
 
 from collections.abc import Mapping
 import logging
+import re
 from typing import Any, Final
 
-from pydactyl import PterodactylClient
-from pydactyl.exceptions import ClientConfigError
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_API_KEY, CONF_HOST
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import Unauthorized
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigEntryState,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, Unauthorized
+from homeassistant.helpers.selector import (
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 
-from .const import DOMAIN
+from .api import (
+    PterodactylApiClient,
+    PterodactylApiError,
+    PterodactylApplicationApiClient,
+    PterodactylAuthError,
+    PterodactylConnectionError,
+    account_unique_id,
+)
+from .const import (
+    CONF_APPLICATION_API_KEY,
+    CONF_BYTES_DEADBAND,
+    CONF_CONSOLE_LINES,
+    CONF_CONSOLE_PATTERNS,
+    CONF_CONSOLE_SERVERS,
+    CONF_CPU_DEADBAND,
+    CONF_FAST_MAX_INTERVAL,
+    CONF_FAST_MIN_INTERVAL,
+    CONF_HIGH_CPU_THRESHOLD,
+    CONF_INFO_INTERVAL,
+    CONF_INVENTORY_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SILENCE,
+    CONF_MONITORED_SERVERS,
+    CONF_NAME_FILTER,
+    CONF_NODE_FILTER,
+    CONF_OFFLINE_MAX_INTERVAL,
+    CONF_OFFLINE_MIN_INTERVAL,
+    CONF_RATE_WINDOW,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_REQUEST_TIMEOUT,
+    CONF_RESTART_LOOP_COUNT,
+    CONF_RESTART_LOOP_WINDOW,
+    CONF_RUNNING_MAX_INTERVAL,
+    CONF_SERVER_EVENTS,
+    CONF_STALE_WINDOW,
+    CONF_SUSTAINED_CPU_THRESHOLD,
+    CONF_SUSTAINED_DURATION,
+    CONF_SUSTAINED_MEMORY_THRESHOLD,
+    CONF_UPTIME_GRANULARITY,
+    CONF_WEBSOCKET_INTERVAL,
+    CONF_WEBSOCKET_SERVERS,
+    DEFAULT_BYTES_DEADBAND,
+    DEFAULT_CONSOLE_LINES,
+    DEFAULT_CPU_DEADBAND,
+    DEFAULT_FAST_MAX_INTERVAL,
+    DEFAULT_FAST_MIN_INTERVAL,
+    DEFAULT_HIGH_CPU_THRESHOLD,
+    DEFAULT_INFO_INTERVAL,
+    DEFAULT_INVENTORY_INTERVAL,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_SILENCE,
+    DEFAULT_OFFLINE_MAX_INTERVAL,
+    DEFAULT_OFFLINE_MIN_INTERVAL,
+    DEFAULT_RATE_WINDOW,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_RESTART_LOOP_COUNT,
+    DEFAULT_RESTART_LOOP_WINDOW,
+    DEFAULT_RUNNING_MAX_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SERVER_EVENTS,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_SUSTAINED_CPU_THRESHOLD,
+    DEFAULT_SUSTAINED_DURATION,
+    DEFAULT_SUSTAINED_MEMORY_THRESHOLD,
+    DEFAULT_UPTIME_GRANULARITY,
+    DEFAULT_WEBSOCKET_INTERVAL,
+    DOMAIN,
+)
+from .console import MAX_CONSOLE_LINES, MAX_CONSOLE_SUBSCRIPTIONS
+from .pool import async_get_pool
+from .servers import ServerInfo
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +108,13 @@ SCHEMA_HOST_AUTH: Final = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
         vol.Required(CONF_API_KEY): str,
+        vol.Optional(CONF_APPLICATION_API_KEY): str,
+    }
+)
+
+SCHEMA_RECONFIGURE: Final = vol.Schema(
+    {
+        vol.Optional(CONF_APPLICATION_API_KEY): str,
     }
 )
 
@@ -32,6 +124,136 @@ SCHEMA_REAUTH: Final = vol.Schema(
     }
 )
 
+SCHEMA_OPTIONS_REFRESH: Final = vol.Schema(
+    {
+        vol.Optional(CONF_INFO_INTERVAL, default=DEFAULT_INFO_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=60)
+        ),
+        vol.Optional(
+            CONF_INVENTORY_INTERVAL, default=DEFAULT_INVENTORY_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_MAX_CONCURRENT_REQUESTS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional(
+            CONF_REQUESTS_PER_MINUTE, default=DEFAULT_REQUESTS_PER_MINUTE
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_REQUEST_TIMEOUT, default=DEFAULT_REQUEST_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=120)
+        ),
+        vol.Optional(CONF_STALE_WINDOW, default=DEFAULT_STALE_WINDOW): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+    }
+)
+
+SCHEMA_OPTIONS_POLLING: Final = vol.Schema(
+    {
+        vol.Optional(
+            CONF_FAST_MIN_INTERVAL, default=DEFAULT_FAST_MIN_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+        vol.Optional(
+            CONF_FAST_MAX_INTERVAL, default=DEFAULT_FAST_MAX_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=5)
+        ),
+        vol.Optional(
+            CONF_RUNNING_MAX_INTERVAL, default=DEFAULT_RUNNING_MAX_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+        vol.Optional(
+            CONF_OFFLINE_MIN_INTERVAL, default=DEFAULT_OFFLINE_MIN_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+        vol.Optional(
+            CONF_OFFLINE_MAX_INTERVAL, default=DEFAULT_OFFLINE_MAX_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+        vol.Optional(
+            CONF_HIGH_CPU_THRESHOLD, default=DEFAULT_HIGH_CPU_THRESHOLD
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+SCHEMA_OPTIONS_WEBSOCKET: Final = vol.Schema(
+    {
+        vol.Optional(
+            CONF_WEBSOCKET_INTERVAL, default=DEFAULT_WEBSOCKET_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_CONSOLE_LINES, default=DEFAULT_CONSOLE_LINES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_CONSOLE_LINES)
+        ),
+        vol.Optional(CONF_CONSOLE_PATTERNS, default=[]): TextSelector(
+            TextSelectorConfig(multiple=True)
+        ),
+    }
+)
+
+SCHEMA_OPTIONS_STATE_WRITES: Final = vol.Schema(
+    {
+        vol.Optional(CONF_CPU_DEADBAND, default=DEFAULT_CPU_DEADBAND): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_BYTES_DEADBAND, default=DEFAULT_BYTES_DEADBAND): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(
+            CONF_UPTIME_GRANULARITY, default=DEFAULT_UPTIME_GRANULARITY
+        ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_MAX_SILENCE, default=DEFAULT_MAX_SILENCE): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_RATE_WINDOW, default=DEFAULT_RATE_WINDOW): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(
+            CONF_LONG_TERM_STATISTICS, default=DEFAULT_LONG_TERM_STATISTICS
+        ): bool,
+    }
+)
+
+SCHEMA_OPTIONS_EVENTS: Final = vol.Schema(
+    {
+        vol.Optional(CONF_SERVER_EVENTS, default=DEFAULT_SERVER_EVENTS): bool,
+        vol.Optional(
+            CONF_RESTART_LOOP_COUNT, default=DEFAULT_RESTART_LOOP_COUNT
+        ): vol.All(vol.Coerce(int), vol.Range(min=2, max=20)),
+        vol.Optional(
+            CONF_RESTART_LOOP_WINDOW, default=DEFAULT_RESTART_LOOP_WINDOW
+        ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+        vol.Optional(
+            CONF_SUSTAINED_CPU_THRESHOLD, default=DEFAULT_SUSTAINED_CPU_THRESHOLD
+        ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(
+            CONF_SUSTAINED_MEMORY_THRESHOLD, default=DEFAULT_SUSTAINED_MEMORY_THRESHOLD
+        ): vol.All(vol.Coerce(float), vol.Range(min=1, max=100)),
+        vol.Optional(
+            CONF_SUSTAINED_DURATION, default=DEFAULT_SUSTAINED_DURATION
+        ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+POLLING_TIERS: Final = (
+    (CONF_FAST_MIN_INTERVAL, CONF_FAST_MAX_INTERVAL),
+    (CONF_SCAN_INTERVAL, CONF_RUNNING_MAX_INTERVAL),
+    (CONF_OFFLINE_MIN_INTERVAL, CONF_OFFLINE_MAX_INTERVAL),
+)
+
+
+def _server_selector(servers: dict[str, ServerInfo]) -> SelectSelector:
+    """Return a selector for several of the given servers."""
+    return SelectSelector(
+        SelectSelectorConfig(
+            options=[
+                SelectOptionDict(value=server_id, label=server.name)
+                for server_id, server in servers.items()
+            ],
+            multiple=True,
+        )
+    )
+
+
+class InvalidApplicationAuth(HomeAssistantError):
+    """The application api key was rejected or lacks read permissions."""
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
@@ -40,14 +262,39 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """
     url = data[CONF_HOST]
     api_key = data[CONF_API_KEY]
+    pool = async_get_pool(hass)
 
     try:
-        pterodactyl_api = PterodactylClient(url, api_key)
-        await hass.async_add_executor_job(pterodactyl_api.client.account.get_account)
-    except ClientConfigError as exception:
+        pterodactyl_api = pool.client(PterodactylApiClient, url, api_key)
+        account = await pterodactyl_api.get_account()
+    except PterodactylAuthError as exception:
+        pool.forget_validation(url, api_key)
         raise Unauthorized from exception
 
-    return {CONF_HOST: url, CONF_API_KEY: api_key}
+    # The setup of the entry can skip the account request.
+    pool.mark_validated(url, api_key)
+
+    info = {
+        CONF_HOST: url,
+        CONF_API_KEY: api_key,
+        # Several accounts of the same panel can be set up side by side.
+        "unique_id": account_unique_id(url, account),
+        "username": account.get("username"),
+    }
+
+    if application_api_key := data.get(CONF_APPLICATION_API_KEY):
+        try:
+            application_api = pool.client(
+                PterodactylApplicationApiClient, url, application_api_key
+            )
+            await application_api.list_nodes()
+        except PterodactylApiError as exception:
+            if exception.status not in (401, 403):
+                raise
+            raise InvalidApplicationAuth from exception
+        info[CONF_APPLICATION_API_KEY] = application_api_key
+
+    return info
 
 
 class ConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -56,6 +303,14 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
     host: str
 
     VERSION = 1
+    # 1.2 adds the account to the unique id, which was the host alone.
+    MINOR_VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return PterodactylOptionsFlow()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -67,13 +322,20 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                 info = await validate_input(self.hass, user_input)
             except Unauthorized:
                 errors["base"] = "invalid_auth"
+            except InvalidApplicationAuth:
+                errors[CONF_APPLICATION_API_KEY] = "invalid_application_auth"
+            except PterodactylConnectionError:
+                errors["base"] = "cannot_connect"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                await self.async_set_unique_id(info[CONF_HOST])
+                await self.async_set_unique_id(info["unique_id"])
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(title=info[CONF_HOST], data=user_input)
+                title = info[CONF_HOST]
+                if info["username"]:
+                    title = f"{info['username']} @ {title}"
+                return self.async_create_entry(title=title, data=user_input)
 
         return self.async_show_form(
             step_id="user",
@@ -99,14 +361,20 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                 info = await validate_input(self.hass, user_input)
             except Unauthorized:
                 errors["base"] = "invalid_auth"
+            except PterodactylConnectionError:
+                errors["base"] = "cannot_connect"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                await self.async_set_unique_id(info[CONF_HOST])
-                self._abort_if_unique_id_mismatch(reason="wrong_account")
+                entry = self._get_reauth_entry()
+                await self.async_set_unique_id(info["unique_id"])
+                if entry.minor_version >= 2:
+                    # Entries not migrated yet only know their host, they are
+                    # migrated when they are set up with the new key.
+                    self._abort_if_unique_id_mismatch(reason="wrong_account")
                 return self.async_update_reload_and_abort(
-                    self._get_reauth_entry(),
+                    entry,
                     data_updates={CONF_API_KEY: info[CONF_API_KEY]},
                 )
         return self.async_show_form(
@@ -114,3 +382,225 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=SCHEMA_REAUTH,
             errors=errors,
         )
+
+    async def async_step_reconfigure(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add, change or remove the application api key."""
+        entry = self._get_reconfigure_entry()
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            data = {
+                CONF_HOST: entry.data[CONF_HOST],
+                CONF_API_KEY: entry.data[CONF_API_KEY],
+            }
+            if application_api_key := user_input.get(CONF_APPLICATION_API_KEY):
+                data[CONF_APPLICATION_API_KEY] = application_api_key
+            try:
+                await validate_input(self.hass, data)
+            except Unauthorized:
+                errors["base"] = "invalid_auth"
+            except InvalidApplicationAuth:
+                errors[CONF_APPLICATION_API_KEY] = "invalid_application_auth"
+            except PterodactylConnectionError:
+                errors["base"] = "cannot_connect"
+            except Exception:
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                return self.async_update_reload_and_abort(entry, data=data)
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=self.add_suggested_values_to_schema(
+                SCHEMA_RECONFIGURE, entry.data
+            ),
+            errors=errors,
+        )
+
+
+class PterodactylOptionsFlow(OptionsFlow):
+    """Handle Pterodactyl Panel options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Choose which options to manage."""
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=[
+                "servers",
+                "refresh",
+                "polling",
+                "websocket",
+                "state_writes",
+                "events",
+            ],
+        )
+
+    async def async_step_servers(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage which servers are monitored."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                re.compile(user_input.get(CONF_NAME_FILTER, ""))
+            except re.error:
+                errors[CONF_NAME_FILTER] = "invalid_name_filter"
+            else:
+                return self._async_update_options(
+                    {
+                        CONF_MONITORED_SERVERS: [],
+                        CONF_NAME_FILTER: "",
+                        CONF_NODE_FILTER: [],
+                        **user_input,
+                    }
+                )
+
+        inventory = self._inventory()
+        nodes = sorted(
+            {
+                server.node
+                for server in inventory.values()
+                if server.node
+            }
+        )
+
+        schema = vol.Schema(
+            {
+                vol.Optional(CONF_MONITORED_SERVERS): _server_selector(inventory),
+                vol.Optional(CONF_NAME_FILTER): str,
+                vol.Optional(CONF_NODE_FILTER): SelectSelector(
+                    SelectSelectorConfig(options=nodes, multiple=True)
+                ),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="servers",
+            data_schema=self.add_suggested_values_to_schema(
+                schema, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
+
+    async def async_step_refresh(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the refresh intervals and request limits."""
+        if user_input is not None:
+            return self._async_update_options(user_input)
+
+        return self.async_show_form(
+            step_id="refresh",
+            data_schema=self.add_suggested_values_to_schema(
+                SCHEMA_OPTIONS_REFRESH, self.config_entry.options
+            ),
+        )
+
+    async def async_step_polling(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the adaptive polling intervals."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if any(
+                user_input[min_key] > user_input[max_key]
+                for min_key, max_key in POLLING_TIERS
+            ):
+                errors["base"] = "invalid_interval_range"
+            else:
+                return self._async_update_options(user_input)
+
+        return self.async_show_form(
+            step_id="polling",
+            data_schema=self.add_suggested_values_to_schema(
+                SCHEMA_OPTIONS_POLLING, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
+
+    async def async_step_websocket(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the servers streamed over websockets."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if len(user_input[CONF_CONSOLE_SERVERS]) > MAX_CONSOLE_SUBSCRIPTIONS:
+                errors[CONF_CONSOLE_SERVERS] = "too_many_console_servers"
+            for pattern in user_input[CONF_CONSOLE_PATTERNS]:
+                try:
+                    re.compile(pattern)
+                except re.error:
+                    errors[CONF_CONSOLE_PATTERNS] = "invalid_console_pattern"
+            if not errors:
+                return self._async_update_options(user_input)
+
+        servers = self._servers()
+        schema = SCHEMA_OPTIONS_WEBSOCKET.extend(
+            {
+                vol.Optional(CONF_WEBSOCKET_SERVERS, default=[]): _server_selector(
+                    servers
+                ),
+                vol.Optional(CONF_CONSOLE_SERVERS, default=[]): _server_selector(
+                    servers
+                ),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="websocket",
+            data_schema=self.add_suggested_values_to_schema(
+                schema, user_input or self.config_entry.options
+            ),
+            errors=errors,
+            description_placeholders={
+                "max_console_servers": str(MAX_CONSOLE_SUBSCRIPTIONS)
+            },
+        )
+
+    async def async_step_state_writes(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage which changes are significant enough to write."""
+        if user_input is not None:
+            return self._async_update_options(user_input)
+
+        return self.async_show_form(
+            step_id="state_writes",
+            data_schema=self.add_suggested_values_to_schema(
+                SCHEMA_OPTIONS_STATE_WRITES, self.config_entry.options
+            ),
+        )
+
+    async def async_step_events(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the server events and their thresholds."""
+        if user_input is not None:
+            return self._async_update_options(user_input)
+
+        return self.async_show_form(
+            step_id="events",
+            data_schema=self.add_suggested_values_to_schema(
+                SCHEMA_OPTIONS_EVENTS, self.config_entry.options
+            ),
+        )
+
+    def _inventory(self) -> dict[str, ServerInfo]:
+        """Return every server listed by the panel, if the entry is loaded."""
+        if self.config_entry.state is not ConfigEntryState.LOADED:
+            return {}
+        return self.config_entry.runtime_data.inventory
+
+    def _servers(self) -> dict[str, ServerInfo]:
+        """Return the monitored servers, if the entry is loaded."""
+        if self.config_entry.state is not ConfigEntryState.LOADED:
+            return {}
+        return self.config_entry.runtime_data.servers
+
+    @callback
+    def _async_update_options(self, user_input: dict[str, Any]) -> ConfigFlowResult:
+        """Store the options of a step next to the other options."""
+        return self.async_create_entry(data={**self.config_entry.options, **user_input})
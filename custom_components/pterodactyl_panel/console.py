@@ -0,0 +1,84 @@
+"""Console output of the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+import re
+from typing import Any, Final
+
+from .const import (
+    CONF_CONSOLE_LINES,
+    CONF_CONSOLE_PATTERNS,
+    DEFAULT_CONSOLE_LINES,
+    DOMAIN,
+)
+
+EVENT_CONSOLE_MATCH: Final = f"{DOMAIN}_console_match"
+
+# At most this many servers have their console followed, each over a websocket.
+MAX_CONSOLE_SUBSCRIPTIONS: Final = 10
+MAX_CONSOLE_LINES: Final = 500
+# Longer lines are cut, so a buffer never holds more than lines times this.
+MAX_LINE_LENGTH: Final = 500
+
+# Colors and cursor movements of the console.
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
+
+
+class ConsoleMonitor:
+    """Keep the last console lines of subscribed servers and match patterns.
+
+    Every subscribed server has a ring buffer of its last lines, so the memory
+    of a console is bounded no matter how much it prints. Every line is matched
+    against the patterns once, when it arrives, and never again. The number of
+    subscribed servers is capped, as each one holds a websocket to the panel.
+    """
+
+    def __init__(self, options: Mapping[str, Any]) -> None:
+        """Initialize the monitor from the config entry options."""
+        self._lines: int = options.get(CONF_CONSOLE_LINES, DEFAULT_CONSOLE_LINES)
+        self._patterns = [
+            re.compile(pattern) for pattern in options.get(CONF_CONSOLE_PATTERNS, [])
+        ]
+        self._buffers: dict[str, deque[str]] = {}
+
+    def subscribe(self, server_id: str) -> bool:
+        """Start buffering the console of a server, unless the cap is reached."""
+        if server_id in self._buffers:
+            return True
+        if len(self._buffers) >= MAX_CONSOLE_SUBSCRIPTIONS:
+            return False
+        self._buffers[server_id] = deque(maxlen=self._lines)
+        return True
+
+    def is_subscribed(self, server_id: str) -> bool:
+        """Return if the console of a server is buffered."""
+        return server_id in self._buffers
+
+    def add_output(self, server_id: str, output: str) -> list[tuple[str, str]]:
+        """Buffer console output and return every pattern and line that matched."""
+        if (buffer := self._buffers.get(server_id)) is None:
+            return []
+
+        matches: list[tuple[str, str]] = []
+        for raw_line in output.splitlines():
+            line = _ANSI_ESCAPE.sub("", raw_line)[:MAX_LINE_LENGTH]
+            buffer.append(line)
+            matches.extend(
+                (pattern.pattern, line)
+                for pattern in self._patterns
+                if pattern.search(line)
+            )
+        return matches
+
+    def tail(self, server_id: str, lines: int | None = None) -> list[str]:
+        """Return the last lines of the console of a server, oldest first."""
+        buffer = self._buffers.get(server_id, ())
+        if lines is None or lines >= len(buffer):
+            return list(buffer)
+        return list(buffer)[-lines:]
+
+    def remove(self, server_id: str) -> None:
+        """Stop buffering the console of a server."""
+        self._buffers.pop(server_id, None)
@@ -7,3 +7,66 @@ PTERODACTYL_ATTRIBUTES = "attributes"
 PTERODACTYL_ID = "identifier"
 PTERODACTYL_NAME = "name"
 PTERODACTYL_DOCKER_IMAGE = "docker_image"
+PTERODACTYL_NODE = "node"
+
+CONF_APPLICATION_API_KEY = "application_api_key"
+CONF_INFO_INTERVAL = "info_interval"
+CONF_INVENTORY_INTERVAL = "inventory_interval"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_WEBSOCKET_SERVERS = "websocket_servers"
+CONF_FAST_MIN_INTERVAL = "fast_min_interval"
+CONF_FAST_MAX_INTERVAL = "fast_max_interval"
+CONF_RUNNING_MAX_INTERVAL = "running_max_interval"
+CONF_OFFLINE_MIN_INTERVAL = "offline_min_interval"
+CONF_OFFLINE_MAX_INTERVAL = "offline_max_interval"
+CONF_HIGH_CPU_THRESHOLD = "high_cpu_threshold"
+CONF_MONITORED_SERVERS = "monitored_servers"
+CONF_NAME_FILTER = "name_filter"
+CONF_NODE_FILTER = "node_filter"
+CONF_WEBSOCKET_INTERVAL = "websocket_interval"
+CONF_CPU_DEADBAND = "cpu_deadband"
+CONF_BYTES_DEADBAND = "bytes_deadband"
+CONF_UPTIME_GRANULARITY = "uptime_granularity"
+CONF_MAX_SILENCE = "max_silence"
+CONF_RATE_WINDOW = "rate_window"
+CONF_STALE_WINDOW = "stale_window"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_SERVER_EVENTS = "server_events"
+CONF_RESTART_LOOP_COUNT = "restart_loop_count"
+CONF_RESTART_LOOP_WINDOW = "restart_loop_window"
+CONF_SUSTAINED_CPU_THRESHOLD = "sustained_cpu_threshold"
+CONF_SUSTAINED_MEMORY_THRESHOLD = "sustained_memory_threshold"
+CONF_SUSTAINED_DURATION = "sustained_duration"
+CONF_CONSOLE_SERVERS = "console_servers"
+CONF_CONSOLE_LINES = "console_lines"
+CONF_CONSOLE_PATTERNS = "console_patterns"
+
+DEFAULT_SCAN_INTERVAL = 60
+DEFAULT_INFO_INTERVAL = 900
+DEFAULT_INVENTORY_INTERVAL = 600
+DEFAULT_WEBSOCKET_INTERVAL = 5
+DEFAULT_MAX_CONCURRENT_REQUESTS = 10
+DEFAULT_REQUESTS_PER_MINUTE = 240
+DEFAULT_REQUEST_TIMEOUT = 10
+DEFAULT_FAST_MIN_INTERVAL = 10
+DEFAULT_FAST_MAX_INTERVAL = 30
+DEFAULT_RUNNING_MAX_INTERVAL = 300
+DEFAULT_OFFLINE_MIN_INTERVAL = 300
+DEFAULT_OFFLINE_MAX_INTERVAL = 1800
+DEFAULT_HIGH_CPU_THRESHOLD = 80
+DEFAULT_CPU_DEADBAND = 1
+DEFAULT_BYTES_DEADBAND = 1
+DEFAULT_UPTIME_GRANULARITY = 300
+DEFAULT_MAX_SILENCE = 900
+DEFAULT_RATE_WINDOW = 0
+DEFAULT_STALE_WINDOW = 600
+DEFAULT_LONG_TERM_STATISTICS = False
+DEFAULT_SERVER_EVENTS = False
+DEFAULT_RESTART_LOOP_COUNT = 3
+DEFAULT_RESTART_LOOP_WINDOW = 600
+DEFAULT_SUSTAINED_CPU_THRESHOLD = 90
+DEFAULT_SUSTAINED_MEMORY_THRESHOLD = 90
+DEFAULT_SUSTAINED_DURATION = 300
+DEFAULT_CONSOLE_LINES = 100
@@ -1,89 +1,1021 @@
 """Data update coordinator for the Pterodactyl Panel integration."""
 
+from __future__ import annotations
+
+import asyncio
+from collections import ChainMap
+from collections.abc import Callable, Iterable, MutableMapping
 from datetime import timedelta
+from functools import partial
 import logging
+import re
+import time
 from typing import Any, Final
 
-from pydactyl import PterodactylClient
-from requests.exceptions import HTTPError
-
+from homeassistant.components.recorder.statistics import async_add_external_statistics
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import PTERODACTYL_ID
+from .actions import (
+    FOLLOW_UP_INTERVAL,
+    FOLLOW_UP_TIMEOUT,
+    POWER_ACTION_TRANSITIONS,
+    PowerActionTracker,
+)
+from .api import (
+    PterodactylApiClient,
+    PterodactylApiError,
+    PterodactylApplicationApiClient,
+    PterodactylAuthError,
+)
+from .const import (
+    CONF_CONSOLE_SERVERS,
+    CONF_INFO_INTERVAL,
+    CONF_INVENTORY_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MONITORED_SERVERS,
+    CONF_NAME_FILTER,
+    CONF_NODE_FILTER,
+    CONF_RATE_WINDOW,
+    CONF_SERVER_EVENTS,
+    CONF_STALE_WINDOW,
+    CONF_WEBSOCKET_INTERVAL,
+    CONF_WEBSOCKET_SERVERS,
+    DEFAULT_INFO_INTERVAL,
+    DEFAULT_INVENTORY_INTERVAL,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_RATE_WINDOW,
+    DEFAULT_SERVER_EVENTS,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_WEBSOCKET_INTERVAL,
+    DOMAIN,
+    PTERODACTYL_NODE,
+)
+from .console import EVENT_CONSOLE_MATCH, MAX_CONSOLE_SUBSCRIPTIONS, ConsoleMonitor
+from .events import ServerEventDetector
+from .nodes import (
+    NodeAggregates,
+    node_context,
+    node_device_identifier,
+    server_contribution,
+)
+from .polling import TRANSITIONAL_STATES, AdaptivePollSchedule
+from .rates import ThroughputRates
+from .resilience import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+from .secondary import ENDPOINT_BACKUPS, SecondaryDataCache, secondary_context
+from .servers import ServerData, ServerInfo
+from .significance import SignificanceFilter
+from .statistics import HourlyStatistics, statistic_metadata
+from .websocket import PterodactylServerWebsocket
 
 _LOGGER = logging.getLogger(__name__)
 
-DEFAULT_SCAN_INTERVAL: Final = timedelta(seconds=60)
 RUNNING_VALUE: Final[str] = "running"
 
+# Listener context of the entities that describe the panel itself.
+PANEL_CONTEXT: Final = "panel"
+
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY: Final = 60
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of the cache of a config entry."""
+    return f"{DOMAIN}.{entry_id}"
+
+
+def server_device_identifier(entry_id: str, server_id: str) -> tuple[str, str]:
+    """Return the device registry identifier of a server."""
+    return (DOMAIN, f"{entry_id}_server_{server_id}")
+
+
+def panel_device_identifier(entry_id: str) -> tuple[str, str]:
+    """Return the device registry identifier of the panel itself."""
+    return (DOMAIN, f"{entry_id}_panel")
+
+
+def server_device_name(server: ServerInfo) -> str:
+    """Return the device name of a server."""
+    return f"Server {server.name}"
+
+
+def _utilization_data(server_utilization: dict[str, Any]) -> dict[str, Any]:
+    """Map a utilization response onto the coordinator data keys."""
+    resources = server_utilization["resources"]
+    return {
+        "is_running": server_utilization["current_state"] == RUNNING_VALUE,
+        "current_state": server_utilization["current_state"],
+        "memory": resources["memory_bytes"],
+        "cpu": resources["cpu_absolute"],
+        "disk": resources["disk_bytes"],
+        "network_tx": resources["network_tx_bytes"],
+        "network_rx": resources["network_rx_bytes"],
+        "uptime": resources["uptime"],
+    }
+
+
+@callback
+def _async_add_to(
+    listeners: list[Callable[[Iterable[str]], None]],
+    add_callback: Callable[[Iterable[str]], None],
+) -> CALLBACK_TYPE:
+    """Add a callback to a list of listeners and return a remove callback."""
+    listeners.append(add_callback)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove the listener."""
+        listeners.remove(add_callback)
+
+    return remove_listener
+
+
+class PterodactylPanelCoordinator(DataUpdateCoordinator[dict[str, ServerData]]):
+    """Pterodactyl Panel data update coordinator.
+
+    A single coordinator refreshes every server on the panel in one cycle. Data is
+    keyed by server identifier and entities subscribe with that identifier as their
+    listener context, so only entities of servers whose data changed are notified.
 
-class PterodactylServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Pterodactyl Panel data update coordinator."""
+    Only servers that are due according to the adaptive poll schedule send a
+    request, and only those count towards the circuit breakers of the panel and
+    the server. A recovering panel is probed with a single request, and failing
+    servers serve their last values, marked as stale, for up to the stale window.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
-        client: PterodactylClient,
-        server: str,
+        client: PterodactylApiClient,
         entry: ConfigEntry,
+        application_client: PterodactylApplicationApiClient | None = None,
     ) -> None:
         """Initialize the Pterodactyl Panel coordinator."""
         self.pterodactyl_api = client
+        self.metrics = client.metrics
+        self.application_api = application_client
         self.url = entry.data[CONF_HOST]
-        self.server = server
+        self.inventory: dict[str, ServerInfo] = {}
+        self.servers: dict[str, ServerInfo] = {}
+        self.applied_options = dict(entry.options)
+        self._servers_listeners: list[Callable[[Iterable[str]], None]] = []
+        self.nodes = NodeAggregates()
+        self._nodes_listeners: list[Callable[[Iterable[str]], None]] = []
+        # Nodes whose entities exist, even while they have no servers.
+        self._announced_nodes: set[str] = set()
+        self._changed_nodes: set[str] = set()
+        self._inventory_interval: int = entry.options.get(
+            CONF_INVENTORY_INTERVAL, DEFAULT_INVENTORY_INTERVAL
+        )
+        self._inventory_updated: float | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(entry.entry_id)
+        )
+        self._changed_servers: set[str] | None = None
+        self._cycle_changed: set[str] = set()
+        self._info_interval: int = entry.options.get(
+            CONF_INFO_INTERVAL, DEFAULT_INFO_INTERVAL
+        )
+        self._server_info: dict[str, ServerInfo] = {}
+        self._server_info_updated: dict[str, float] = {}
+        self._websockets: dict[str, PterodactylServerWebsocket] = {}
+        self._websocket_tasks: dict[str, asyncio.Task[None]] = {}
+        self._stream_interval: int = entry.options.get(
+            CONF_WEBSOCKET_INTERVAL, DEFAULT_WEBSOCKET_INTERVAL
+        )
+        self._stream_pending: dict[str, dict[str, Any]] = {}
+        self._stream_written: dict[str, float] = {}
+        self._stream_unsub: dict[str, CALLBACK_TYPE] = {}
+        self._poll_schedule = AdaptivePollSchedule(entry.options)
+        self.significance = SignificanceFilter(entry.options)
+        self.power_actions = PowerActionTracker()
+        self.panel_breaker = CircuitBreaker(failure_threshold=2)
+        self.server_breakers: dict[str, CircuitBreaker] = {}
+        self._stale_window: int = entry.options.get(
+            CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW
+        )
+        self._stale_since: dict[str, float] = {}
+        self._cycle_succeeded: set[str] = set()
+        self._cycle_failed: set[str] = set()
+        self._follow_ups: dict[str, asyncio.Task[None]] = {}
+        self._throughput = ThroughputRates(
+            entry.options.get(CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW)
+        )
+        self.secondary = SecondaryDataCache(
+            hass, entry, client, self._async_handle_secondary_update
+        )
+        self.server_events: ServerEventDetector | None = None
+        if entry.options.get(CONF_SERVER_EVENTS, DEFAULT_SERVER_EVENTS):
+            self.server_events = ServerEventDetector(entry.options)
+        self.console: ConsoleMonitor | None = None
+        if entry.options.get(CONF_CONSOLE_SERVERS):
+            self.console = ConsoleMonitor(entry.options)
+        self.statistics: HourlyStatistics | None = None
+        if entry.options.get(CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS):
+            self.statistics = HourlyStatistics()
 
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=self.url,
-            update_interval=DEFAULT_SCAN_INTERVAL,
+            update_interval=timedelta(seconds=self._poll_schedule.min_interval),
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch all Pterodactyl data."""
-        data = {}
-        server_id = self.server[PTERODACTYL_ID]
+    @callback
+    def async_set_inventory(self, servers: list[ServerInfo]) -> None:
+        """Set the servers listed by the panel."""
+        self.inventory = {server.identifier: server for server in servers}
+        self._inventory_updated = time.monotonic()
+
+    def _is_monitored(self, server: ServerInfo) -> bool:
+        """Return if a server is selected by the server options."""
+        options = self.config_entry.options
+        if (
+            monitored := options.get(CONF_MONITORED_SERVERS)
+        ) and server.identifier not in monitored:
+            return False
+        if (name_filter := options.get(CONF_NAME_FILTER)) and not re.search(
+            name_filter, server.name, re.IGNORECASE
+        ):
+            return False
+        if (node_filter := options.get(CONF_NODE_FILTER)) and (
+            server.node not in node_filter
+        ):
+            return False
+        return True
+
+    @callback
+    def async_add_servers_listener(
+        self, add_callback: Callable[[Iterable[str]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for servers added to the panel after setup."""
+        return _async_add_to(self._servers_listeners, add_callback)
+
+    @callback
+    def async_add_nodes_listener(
+        self, add_callback: Callable[[Iterable[str]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for nodes that get their first server after setup."""
+        return _async_add_to(self._nodes_listeners, add_callback)
 
+    async def _async_update_inventory(self) -> None:
+        """List the servers of the panel and apply the changes."""
         try:
-            # Pull from utilization endpoint
-            server_utilization = await self.hass.async_add_executor_job(
-                self.pterodactyl_api.client.servers.get_server_utilization, server_id
+            servers = await self.async_list_servers()
+        except PterodactylAuthError as e:
+            raise ConfigEntryAuthFailed from e
+        except PterodactylApiError as e:
+            _LOGGER.debug("Failed to list the servers of %s: %s", self.url, e)
+            return
+
+        self.async_update_servers(servers)
+
+    async def async_list_servers(self) -> list[dict[str, Any]]:
+        """List the servers of the panel, from the application api if possible."""
+        if self.application_api is not None:
+            return await self.application_api.list_servers()
+        return await self.pterodactyl_api.list_servers()
+
+    @callback
+    def async_update_servers(self, servers: list[dict[str, Any]]) -> None:
+        """Apply a fresh server listing of the panel."""
+        now = time.monotonic()
+        records: list[ServerInfo] = []
+        for server in servers:
+            # Only the application api knows the capacity of the nodes.
+            if server.get("node_memory") is not None:
+                self.nodes.set_capacity(
+                    server[PTERODACTYL_NODE], server["node_memory"], server["node_disk"]
+                )
+            # The listing carries the server info as well.
+            info = ServerInfo.from_api(server)
+            records.append(info)
+            self._server_info[info.identifier] = info
+            self._server_info_updated[info.identifier] = now
+
+        self.async_set_inventory(records)
+        self.async_apply_server_selection()
+
+    @callback
+    def async_apply_server_selection(self) -> None:
+        """Add, remove or update the monitored servers from the inventory.
+
+        Only servers selected by the server options are monitored; all others get
+        no entities and are never requested.
+        """
+        servers = {
+            server_id: server
+            for server_id, server in self.inventory.items()
+            if self._is_monitored(server)
+        }
+        previous_servers = self.servers
+        self.servers = servers
+
+        device_registry = dr.async_get(self.hass)
+        entry_id = self.config_entry.entry_id
+
+        for server_id in previous_servers.keys() - servers.keys():
+            _LOGGER.debug("Server %s is no longer monitored on %s", server_id, self.url)
+            self._async_remove_server(server_id)
+            if device := device_registry.async_get_device(
+                identifiers={server_device_identifier(entry_id, server_id)}
+            ):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry_id
+                )
+
+        for server_id in previous_servers.keys() & servers.keys():
+            previous, server = previous_servers[server_id], servers[server_id]
+            if (
+                previous.name == server.name
+                and previous.docker_image == server.docker_image
+            ):
+                continue
+            if device := device_registry.async_get_device(
+                identifiers={server_device_identifier(entry_id, server_id)}
+            ):
+                device_registry.async_update_device(
+                    device.id,
+                    name=server_device_name(server),
+                    sw_version=server.docker_image,
+                )
+
+        if added := servers.keys() - previous_servers.keys():
+            _LOGGER.debug("Servers %s are now monitored on %s", added, self.url)
+            for server_id in added:
+                self._async_start_websocket(server_id)
+            for add_callback in list(self._servers_listeners):
+                add_callback(added)
+
+    @callback
+    def async_remove_stale_devices(self) -> None:
+        """Remove the devices of servers that are no longer monitored."""
+        device_registry = dr.async_get(self.hass)
+        entry_id = self.config_entry.entry_id
+        identifiers = {
+            server_device_identifier(entry_id, server_id) for server_id in self.servers
+        } | {node_device_identifier(entry_id, node) for node in self.nodes.totals}
+        identifiers.add(panel_device_identifier(entry_id))
+
+        for device in dr.async_entries_for_config_entry(device_registry, entry_id):
+            if not device.identifiers & identifiers:
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry_id
+                )
+
+    @callback
+    def _async_remove_server(self, server_id: str) -> None:
+        """Drop the state kept for a server that no longer exists."""
+        self._server_info.pop(server_id, None)
+        self._server_info_updated.pop(server_id, None)
+        self._poll_schedule.remove(server_id)
+        self._throughput.remove(server_id)
+        self.power_actions.remove(server_id)
+        self.secondary.async_remove(server_id)
+        if self.server_events is not None:
+            self.server_events.remove(server_id)
+        if self.console is not None:
+            self.console.remove(server_id)
+        if self.statistics is not None:
+            self.statistics.remove(server_id)
+        self.server_breakers.pop(server_id, None)
+        self._stale_since.pop(server_id, None)
+        if task := self._follow_ups.pop(server_id, None):
+            task.cancel()
+        self._stream_pending.pop(server_id, None)
+        self._stream_written.pop(server_id, None)
+        if unsub := self._stream_unsub.pop(server_id, None):
+            unsub()
+        self._websockets.pop(server_id, None)
+        if task := self._websocket_tasks.pop(server_id, None):
+            task.cancel()
+        if changed_nodes := self.nodes.remove(server_id):
+            self._async_update_context_listeners(
+                {node_context(node) for node in changed_nodes}
             )
-            # Pull from server info endpoint
-            server_info = await self.hass.async_add_executor_job(
-                self.pterodactyl_api.client.servers.get_server, server_id
+
+    async def async_restore(self) -> bool:
+        """Restore the server list and last data from the cache, if any."""
+        if not (cache := await self._store.async_load()):
+            return False
+
+        self.async_set_inventory(
+            [ServerInfo.from_api(server) for server in cache["servers"]]
+        )
+        self._inventory_updated = None
+        self.async_apply_server_selection()
+        self.data = {
+            server_id: ServerData.from_dict(server_data)
+            for server_id, server_data in cache["data"].items()
+            if server_id in self.servers
+        }
+        self._async_update_nodes(self.data, self.data)
+        return True
+
+    @callback
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the server list and data to cache."""
+        return {
+            "servers": [server.as_dict() for server in self.inventory.values()],
+            "data": {
+                server_id: server_data.as_dict()
+                for server_id, server_data in (self.data or {}).items()
+            },
+        }
+
+    async def _async_update_data(self) -> dict[str, ServerData]:
+        """Fetch Pterodactyl data for every server, timing the cycle."""
+        cycle_start = time.monotonic()
+        try:
+            return await self._async_update_cycle()
+        finally:
+            self.metrics.record_cycle(time.monotonic() - cycle_start)
+
+    async def _async_update_cycle(self) -> dict[str, ServerData]:
+        """Fetch Pterodactyl data for every server."""
+        # Notify every listener unless this cycle completes and narrows it down.
+        self._changed_servers = None
+        self._cycle_changed = set()
+
+        server_ids = list(self.servers)
+        inventory_due = False
+
+        now = time.monotonic()
+        if (
+            self.panel_breaker.state(now) == STATE_HALF_OPEN
+            and (probe := self._probe_server(server_ids, now)) is not None
+            and self.panel_breaker.allow(now)
+        ):
+            # A recovering panel gets a single request first instead of the
+            # requests of every server at once.
+            await self._async_probe_panel(probe)
+
+        if self.panel_breaker.allow(time.monotonic()):
+            inventory_due = (
+                self._inventory_updated is None
+                or time.monotonic() - self._inventory_updated
+                >= self._inventory_interval
             )
+            if inventory_due:
+                await self._async_update_inventory()
+                server_ids = list(self.servers)
+
+            data = await self._async_fetch_servers(server_ids)
+        else:
+            # The panel keeps failing, serve what is left until it may be retried.
+            now = time.monotonic()
+            data = {
+                server_id: stale
+                for server_id in server_ids
+                if (stale := self._stale_server_data(server_id, now)) is not None
+            }
+
+        self._async_schedule_next_cycle()
+
+        if server_ids and not data:
+            raise UpdateFailed(f"Failed to get data from all servers of {self.url}")
+
+        if self.last_update_success and self.data is not None:
+            # Records are updated in place, so they note their own changes.
+            self._changed_servers = {
+                server_id
+                for server_id in server_ids
+                if server_id in self._cycle_changed
+                or (server_id in self.data) != (server_id in data)
+            }
+
+        # A new server list can change limits without changing any data.
+        self._changed_nodes = self._async_update_nodes(
+            data,
+            server_ids
+            if self._changed_servers is None or inventory_due
+            else self._changed_servers,
+        )
 
-        except HTTPError as e:
-            if e.response.status_code == 401:
-                raise ConfigEntryAuthFailed from e
+        self._store.async_delay_save(self._cache_data, STORAGE_SAVE_DELAY)
 
-            raise UpdateFailed(f"Failed to get data from {server_id}") from e
+        if self.statistics is not None:
+            self._async_import_statistics(data)
 
-        # Add server utilization data.
-        data["is_running"] = server_utilization["current_state"] == RUNNING_VALUE
-        data["current_state"] = server_utilization["current_state"]
-        data["memory"] = server_utilization["resources"]["memory_bytes"]
-        data["cpu"] = server_utilization["resources"]["cpu_absolute"]
-        data["disk"] = server_utilization["resources"]["disk_bytes"]
-        data["network_tx"] = server_utilization["resources"]["network_tx_bytes"]
-        data["network_rx"] = server_utilization["resources"]["network_rx_bytes"]
-        data["uptime"] = server_utilization["resources"]["uptime"]
+        return data
+
+    @callback
+    def _async_import_statistics(self, data: dict[str, ServerData]) -> None:
+        """Aggregate the current values and import every completed hour."""
+        now = dt_util.utcnow()
+        for server_id, server_data in data.items():
+            if not server_data.stale:
+                self.statistics.add(server_id, server_data, now)
+
+        completed = self.statistics.pop_completed()
+        if not completed or "recorder" not in self.hass.config.components:
+            return
+
+        entry_id = self.config_entry.entry_id
+        for (server_id, key), statistics in completed.items():
+            if (server := self.servers.get(server_id)) is not None:
+                async_add_external_statistics(
+                    self.hass, statistic_metadata(entry_id, server, key), statistics
+                )
+
+    async def _async_fetch_servers(
+        self, server_ids: list[str]
+    ) -> dict[str, ServerData]:
+        """Fetch the data of the given servers and judge the health of the panel."""
+        self._cycle_succeeded = set()
+        self._cycle_failed = set()
+        results = await asyncio.gather(
+            *(self._async_fetch_server(server_id) for server_id in server_ids),
+            return_exceptions=True,
+        )
+
+        # A failing server only makes its own entities unavailable.
+        data: dict[str, ServerData] = {}
+        for server_id, result in zip(server_ids, results, strict=True):
+            if isinstance(result, ConfigEntryAuthFailed):
+                raise result
+            if isinstance(result, UpdateFailed):
+                _LOGGER.debug("Skipping server %s: %s", server_id, result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            data[server_id] = result
+
+        # Only a panel that fails every request it gets counts as down.
+        if self._cycle_succeeded:
+            self.panel_breaker.record_success()
+        elif self._cycle_failed:
+            self.panel_breaker.record_failure(time.monotonic())
+
+        return data
+
+    def _probe_server(self, server_ids: list[str], now: float) -> str | None:
+        """Return a server whose own circuit lets it probe the panel."""
+        return next(
+            (
+                server_id
+                for server_id in server_ids
+                if server_id not in self.server_breakers
+                or self.server_breakers[server_id].state(now) == STATE_CLOSED
+            ),
+            None,
+        )
+
+    async def _async_probe_panel(self, server_id: str) -> None:
+        """Send the trial request of the half open panel circuit."""
+        try:
+            await self.pterodactyl_api.get_server_utilization(server_id)
+        except PterodactylAuthError as e:
+            raise ConfigEntryAuthFailed from e
+        except PterodactylApiError as e:
+            _LOGGER.debug("Probe of %s failed: %s", self.url, e)
+            self.panel_breaker.record_failure(time.monotonic())
+            return
+        _LOGGER.debug("Probe of %s succeeded", self.url)
+        self.panel_breaker.record_success()
+
+    @callback
+    def _async_schedule_next_cycle(self) -> None:
+        """Time the next cycle for the next due server or the panel's retry."""
+        now = time.monotonic()
+        if self.panel_breaker.state(now) == STATE_OPEN:
+            # Jittered by the breaker, so panels don't retry in lockstep.
+            next_due = self.panel_breaker.retry_in(now)
+        else:
+            # Wake up for the next due server, but still check the inventory in time.
+            next_due = self._poll_schedule.next_due(now)
+            if next_due is None:
+                next_due = self._inventory_interval
+            next_due = min(next_due, self._inventory_interval)
+
+        self.update_interval = timedelta(
+            seconds=max(next_due, self._poll_schedule.min_interval)
+        )
+
+    def _stale_server_data(self, server_id: str, now: float) -> ServerData | None:
+        """Return the last known data of a failing server while it may be served."""
+        since = self._stale_since.setdefault(server_id, now)
+        if self.data is None or (data := self.data.get(server_id)) is None:
+            return None
+        if now - since > self._stale_window:
+            return None
+        if data.apply({"stale": True}):
+            self._cycle_changed.add(server_id)
+        return data
+
+    async def _async_fetch_server(self, server_id: str) -> ServerData:
+        """Fetch the Pterodactyl data of a single server."""
+        values: dict[str, Any] = {}
+        now = time.monotonic()
+        breaker = self.server_breakers.setdefault(server_id, CircuitBreaker())
+        data = self.data.get(server_id) if self.data is not None else None
+
+        # Streamed servers keep the latest pushed values and servers that are
+        # not due yet the values of their last poll.
+        poll_due = data is None or (
+            not self._is_streaming(server_id)
+            and self._poll_schedule.is_due(server_id, now)
+        )
+        # Only servers that send a request tell anything about their health.
+        requested = poll_due or self._server_info_outdated(server_id)
+
+        if requested and not breaker.allow(now):
+            if (stale := self._stale_server_data(server_id, now)) is None:
+                raise UpdateFailed(f"Circuit of {server_id} is open")
+            return stale
+
+        try:
+            # Pull from server info endpoint when the cached info is outdated
+            server_info = await self._async_get_server_info(server_id)
+
+            if poll_due:
+                # Pull from utilization endpoint
+                server_utilization = (
+                    await self.pterodactyl_api.get_server_utilization(server_id)
+                )
+                values = _utilization_data(server_utilization)
+                self._async_update_rates(server_id, values, now)
+                self._async_apply_power_action(server_id, values, now)
+                self._poll_schedule.record(server_id, data, values, now)
+
+        except PterodactylAuthError as e:
+            raise ConfigEntryAuthFailed from e
+        except PterodactylApiError as e:
+            breaker.record_failure(now)
+            self._cycle_failed.add(server_id)
+            if (stale := self._stale_server_data(server_id, now)) is None:
+                raise UpdateFailed(f"Failed to get data from {server_id}") from e
+            _LOGGER.debug("Serving stale data of %s: %s", server_id, e)
+            return stale
+
+        if requested:
+            breaker.record_success()
+            self._cycle_succeeded.add(server_id)
+            self._stale_since.pop(server_id, None)
+            values["stale"] = False
 
         # Add server info data.
-        data["node"] = server_info["node"]
-        data["is_node_under_maintenance"] = server_info["is_node_under_maintenance"]
+        values["node"] = server_info.node
+        values["is_node_under_maintenance"] = server_info.is_node_under_maintenance
 
+        if data is None:
+            data = ServerData()
+            self._cycle_changed.add(server_id)
+        if data.apply(values):
+            self._cycle_changed.add(server_id)
+        if "current_state" in values:
+            self._async_detect_events(server_id, data, now)
         return data
 
-    async def send_power_action(self, action: str):
-        """Send power action to Pterodactyl Panel api."""
-        await self.hass.async_add_executor_job(
-            self.pterodactyl_api.client.servers.send_power_action,
-            self.server[PTERODACTYL_ID],
-            action,
+    @callback
+    def _async_detect_events(
+        self, server_id: str, data: ServerData, now: float
+    ) -> None:
+        """Fire the events a fresh sample of a server completes."""
+        if self.server_events is None or (
+            server := self.servers.get(server_id)
+        ) is None:
+            return
+
+        for event_type, event_data in self.server_events.observe(
+            server_id, data, server, now
+        ):
+            _LOGGER.debug("Server %s on %s: %s", server_id, self.url, event_type)
+            self.hass.bus.async_fire(
+                event_type,
+                {
+                    "entry_id": self.config_entry.entry_id,
+                    "server_id": server_id,
+                    "name": server.name,
+                    **event_data,
+                },
+            )
+
+    def _server_info_outdated(self, server_id: str) -> bool:
+        """Return if the server info has to be fetched before it is used."""
+        if (updated := self._server_info_updated.get(server_id)) is None:
+            return True
+        # The application api server list keeps the info up to date.
+        return (
+            self.application_api is None
+            and time.monotonic() - updated >= self._info_interval
+        )
+
+    async def _async_get_server_info(self, server_id: str) -> ServerInfo:
+        """Return the server info, fetching it only when it is outdated."""
+        if not self._server_info_outdated(server_id):
+            return self._server_info[server_id]
+
+        server_info = ServerInfo.from_api(
+            await self.pterodactyl_api.get_server(server_id)
+        )
+        self._server_info[server_id] = server_info
+        self._server_info_updated[server_id] = time.monotonic()
+        return server_info
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners of servers whose data changed."""
+        if self._changed_servers is None:
+            super().async_update_listeners()
+            return
+
+        self._async_update_context_listeners(
+            self._changed_servers
+            | {node_context(node) for node in self._changed_nodes}
+            | {PANEL_CONTEXT}
         )
+
+    @callback
+    def _async_update_context_listeners(self, contexts: set[Any]) -> None:
+        """Notify the listeners of the given servers and nodes."""
+        for update_callback, context in list(self._listeners.values()):
+            if context in contexts:
+                update_callback()
+
+    @callback
+    def _async_handle_secondary_update(self, server_id: str) -> None:
+        """Notify the secondary data entities of a server."""
+        self._async_update_context_listeners({secondary_context(server_id)})
+
+    @callback
+    def _async_update_nodes(
+        self, data: dict[str, ServerData], server_ids: Iterable[str]
+    ) -> set[str]:
+        """Update the node totals from the given servers and return changed nodes."""
+        changed_nodes: set[str] = set()
+
+        for server_id in server_ids:
+            server_data = data.get(server_id)
+            if server_data is None or server_data.node is None:
+                changed_nodes |= self.nodes.remove(server_id)
+                continue
+            changed_nodes |= self.nodes.update(
+                server_id,
+                server_data.node,
+                server_contribution(server_data, self._server_info.get(server_id)),
+            )
+
+        if added := self.nodes.totals.keys() - self._announced_nodes:
+            _LOGGER.debug("Nodes %s now have servers on %s", added, self.url)
+            self._announced_nodes |= added
+            for add_callback in list(self._nodes_listeners):
+                add_callback(added)
+
+        return changed_nodes
+
+    @callback
+    def _async_start_websocket(self, server_id: str) -> None:
+        """Start streaming the stats or console of a server if it is selected."""
+        if server_id in self._websockets:
+            return
+
+        options = self.config_entry.options
+        stream_stats = server_id in options.get(CONF_WEBSOCKET_SERVERS, [])
+        follow_console = False
+        if self.console is not None and server_id in options.get(
+            CONF_CONSOLE_SERVERS, []
+        ):
+            follow_console = self.console.subscribe(server_id)
+            if not follow_console:
+                _LOGGER.warning(
+                    "Not following the console of %s, %d are followed already",
+                    server_id,
+                    MAX_CONSOLE_SUBSCRIPTIONS,
+                )
+        if not (stream_stats or follow_console):
+            return
+
+        websocket = PterodactylServerWebsocket(
+            self.pterodactyl_api,
+            server_id,
+            self._async_handle_stream_update if stream_stats else None,
+            self._async_handle_stream_connection,
+            self._async_handle_console_output if follow_console else None,
+        )
+        self._websockets[server_id] = websocket
+        self._websocket_tasks[server_id] = (
+            self.config_entry.async_create_background_task(
+                self.hass,
+                websocket.async_run(),
+                f"{DOMAIN} websocket {server_id}",
+            )
+        )
+
+    def _is_streaming(self, server_id: str) -> bool:
+        """Return if the utilization of a server is currently pushed."""
+        websocket = self._websockets.get(server_id)
+        return (
+            websocket is not None
+            and websocket.streams_stats
+            and websocket.connected
+            and self.data is not None
+            and server_id in self.data
+        )
+
+    @callback
+    def _async_handle_stream_connection(self, server_id: str, connected: bool) -> None:
+        """Log websocket connection changes, polling covers disconnected servers."""
+        _LOGGER.debug(
+            "Websocket of %s %s",
+            server_id,
+            "connected" if connected else "disconnected",
+        )
+
+    @callback
+    def _async_handle_console_output(self, server_id: str, output: str) -> None:
+        """Buffer console output and fire an event for every matching line."""
+        if self.console is None or (server := self.servers.get(server_id)) is None:
+            return
+
+        for pattern, line in self.console.add_output(server_id, output):
+            self.hass.bus.async_fire(
+                EVENT_CONSOLE_MATCH,
+                {
+                    "entry_id": self.config_entry.entry_id,
+                    "server_id": server_id,
+                    "name": server.name,
+                    "pattern": pattern,
+                    "line": line,
+                },
+            )
+
+    @callback
+    def _async_handle_stream_update(
+        self, server_id: str, values: dict[str, Any]
+    ) -> None:
+        """Collect pushed values and write them at most once per stream interval."""
+        self._stream_pending.setdefault(server_id, {}).update(values)
+
+        if server_id in self._stream_unsub:
+            return
+
+        delay = self._stream_interval - (
+            time.monotonic() - self._stream_written.get(server_id, 0)
+        )
+        if delay <= 0:
+            self._async_write_stream_update(server_id)
+            return
+
+        self._stream_unsub[server_id] = async_call_later(
+            self.hass, delay, partial(self._async_write_stream_update, server_id)
+        )
+
+    @callback
+    def _async_write_stream_update(self, server_id: str, _now: Any = None) -> None:
+        """Merge the pending pushed values into the server data."""
+        self._stream_unsub.pop(server_id, None)
+        values = self._stream_pending.pop(server_id, None)
+        if not values:
+            return
+
+        self._stream_written[server_id] = time.monotonic()
+        self._async_merge_server_values(server_id, values)
+
+    @callback
+    def _async_merge_server_values(
+        self, server_id: str, values: dict[str, Any], polled: bool = False
+    ) -> None:
+        """Merge fresh values into the data of a server outside a refresh cycle.
+
+        Polled values also schedule the next poll of the server.
+        """
+        if self.data is None or (data := self.data.get(server_id)) is None:
+            return
+
+        now = time.monotonic()
+        # Fresh values are looked up first, and written to, before the record.
+        merged = ChainMap(dict(values), data)
+        merged["is_running"] = merged["current_state"] == RUNNING_VALUE
+        if "network_rx" in values:
+            self._async_update_rates(server_id, merged, now)
+        self._async_apply_power_action(server_id, merged, now)
+        if polled:
+            self._poll_schedule.record(server_id, data, merged, now)
+
+        changed = data.apply(merged.maps[0])
+        if values:
+            self._async_detect_events(server_id, data, now)
+        if changed:
+            changed_nodes = self._async_update_nodes(self.data, (server_id,))
+            self._async_update_context_listeners(
+                {server_id} | {node_context(node) for node in changed_nodes}
+            )
+
+    @callback
+    def _async_update_rates(
+        self, server_id: str, data: MutableMapping[str, Any], now: float
+    ) -> None:
+        """Derive the network rates of a server from its fresh counters."""
+        data["network_rx_rate"], data["network_tx_rate"] = self._throughput.add(
+            server_id, now, data
+        )
+
+    @callback
+    def _async_apply_power_action(
+        self, server_id: str, data: MutableMapping[str, Any], now: float
+    ) -> None:
+        """Show a transitional state until the panel reports a pending action."""
+        pending = self.power_actions.settle(server_id, data["current_state"], now)
+        if pending is not None and data["current_state"] not in TRANSITIONAL_STATES:
+            data["current_state"] = POWER_ACTION_TRANSITIONS[pending.action]
+            data["is_running"] = False
+
+    @callback
+    def _async_start_follow_up(self, server_id: str) -> None:
+        """Poll a server closely until its pending power action settles."""
+        if server_id in self._follow_ups:
+            # Already following the server, the new action is picked up.
+            return
+
+        self._follow_ups[server_id] = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_follow_up(server_id),
+            f"{DOMAIN} follow up {server_id}",
+        )
+
+    async def _async_follow_up(self, server_id: str) -> None:
+        """Poll a server until its pending power action settles or expires."""
+        try:
+            while (pending := self.power_actions.get(server_id)) is not None:
+                await asyncio.sleep(FOLLOW_UP_INTERVAL)
+                now = time.monotonic()
+                if now - pending.sent >= FOLLOW_UP_TIMEOUT:
+                    # The panel never reported the action, drop its made up state
+                    # and poll the server in the next cycle instead.
+                    _LOGGER.debug("Power action of %s did not settle", server_id)
+                    self.power_actions.remove(server_id)
+                    self._poll_schedule.remove(server_id)
+                    await self.async_request_refresh()
+                    return
+
+                breaker = self.server_breakers.setdefault(server_id, CircuitBreaker())
+                if (
+                    # The websocket reports the state as soon as it changes.
+                    self._is_streaming(server_id)
+                    # Only refresh cycles probe a failing panel.
+                    or self.panel_breaker.state(now) != STATE_CLOSED
+                    or not breaker.allow(now)
+                ):
+                    continue
+
+                try:
+                    server_utilization = (
+                        await self.pterodactyl_api.get_server_utilization(server_id)
+                    )
+                except PterodactylApiError as err:
+                    _LOGGER.debug("Failed to follow up on %s: %s", server_id, err)
+                    breaker.record_failure(time.monotonic())
+                    continue
+
+                breaker.record_success()
+
+                self._async_merge_server_values(
+                    server_id, _utilization_data(server_utilization), polled=True
+                )
+        finally:
+            self._follow_ups.pop(server_id, None)
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending stream writes and refreshes on shutdown."""
+        await super().async_shutdown()
+        self.secondary.async_shutdown()
+        for unsub in self._stream_unsub.values():
+            unsub()
+        self._stream_unsub.clear()
+
+    async def send_power_action(self, server_id: str, action: str):
+        """Send power action to Pterodactyl Panel api."""
+        now = time.monotonic()
+        if self.power_actions.is_duplicate(server_id, action, now):
+            _LOGGER.debug("Ignoring repeated %s of %s", action, server_id)
+            return
+
+        self.power_actions.start(server_id, action, now)
+        try:
+            await self.pterodactyl_api.send_power_action(server_id, action)
+        except PterodactylApiError:
+            self.power_actions.remove(server_id)
+            raise
+
+        if self.server_events is not None:
+            self.server_events.note_power_action(server_id, now)
+
+        # Show the transition right away and follow the server until it settles.
+        if self.application_api is None:
+            self._server_info_updated.pop(server_id, None)
+        self._async_merge_server_values(server_id, {})
+        self._async_start_follow_up(server_id)
+
+    async def async_create_backup(self, server_id: str) -> None:
+        """Start a backup of a server and refresh its backups."""
+        await self.pterodactyl_api.create_backup(server_id)
+        self.secondary.async_invalidate(server_id, ENDPOINT_BACKUPS)
@@ -0,0 +1,52 @@
+"""Diagnostics support for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_APPLICATION_API_KEY
+from .coordinator import PterodactylPanelCoordinator
+from .resilience import STATE_OPEN
+
+TO_REDACT = {CONF_API_KEY, CONF_APPLICATION_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: PterodactylPanelCoordinator = entry.runtime_data
+    now = time.monotonic()
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "inventory": len(coordinator.inventory),
+            "servers": len(coordinator.servers),
+            "nodes": len(coordinator.nodes.totals),
+            "application_api": coordinator.application_api is not None,
+            "panel_circuit": coordinator.panel_breaker.state(now),
+            "open_server_circuits": sorted(
+                server_id
+                for server_id, breaker in coordinator.server_breakers.items()
+                if breaker.state(now) == STATE_OPEN
+            ),
+        },
+        "secondary_entries": coordinator.secondary.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+    }
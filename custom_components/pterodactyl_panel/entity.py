@@ -1,55 +1,251 @@
 """Base entity for the Pterodactyl Panel integration."""
 
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    DOMAIN,
-    PROPER_NAME,
-    PTERODACTYL_DOCKER_IMAGE,
-    PTERODACTYL_ID,
-    PTERODACTYL_NAME,
+from .const import PROPER_NAME
+from .coordinator import (
+    PANEL_CONTEXT,
+    PterodactylPanelCoordinator,
+    panel_device_identifier,
+    server_device_identifier,
+    server_device_name,
 )
-from .coordinator import PterodactylServerCoordinator
+from .nodes import node_context, node_device_identifier, node_device_name
+from .secondary import secondary_context
 
 
 @dataclass(frozen=True, kw_only=True)
 class PterodactylEntityDescription(EntityDescription):
     """Describe a Pterodactyl Panel entity."""
 
+    # How changes of the value are judged, None writes every update.
+    significance: str | None = None
 
-class PterodactylEntity(CoordinatorEntity):
-    """Base Pterodactyl Panel entity."""
+
+class _PterodactylCoordinatorEntity(
+    CoordinatorEntity[PterodactylPanelCoordinator], ABC
+):
+    """Coordinator entity that only writes significant state changes."""
 
     _attr_has_entity_name = True
+    entity_description: PterodactylEntityDescription
+
+    _written_value: Any = None
+    _written_at: float | None = None
+    _written_stale: bool = False
+
+    @abstractmethod
+    def _state_value(self) -> Any:
+        """Return the value the state of this entity is derived from."""
+
+    def _is_stale(self) -> bool:
+        """Return if the state of this entity is a last known value."""
+        return False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if it changed significantly since the last write."""
+        significance = self.entity_description.significance
+        if significance is None or not self.available:
+            self._written_at = None
+            super()._handle_coordinator_update()
+            return
+
+        value = self._state_value()
+        stale = self._is_stale()
+        now = time.monotonic()
+        if (
+            self._written_at is not None
+            and stale == self._written_stale
+            and not self.coordinator.significance.is_significant(
+                significance, self._written_value, value, now - self._written_at
+            )
+        ):
+            return
+
+        self._written_value = value
+        self._written_at = now
+        self._written_stale = stale
+        super()._handle_coordinator_update()
+
+
+class PterodactylEntity(_PterodactylCoordinatorEntity):
+    """Base Pterodactyl Panel entity."""
 
     def __init__(
         self,
-        coordinator: PterodactylServerCoordinator,
+        coordinator: PterodactylPanelCoordinator,
         entry: ConfigEntry,
+        server_id: str,
         description: PterodactylEntityDescription,
     ) -> None:
         """Initialize the Pterodactyl Panel sensor."""
-        super().__init__(coordinator)
-        self._attr_unique_id = (
-            f"{entry.entry_id}_{coordinator.server[PTERODACTYL_ID]}_{description.key}"
+        super().__init__(coordinator, context=server_id)
+        self.server_id = server_id
+        server = coordinator.servers[server_id]
+        self._attr_unique_id = f"{entry.entry_id}_{server_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            entry_type=dr.DeviceEntryType.SERVICE,
+            configuration_url=coordinator.url,
+            identifiers={server_device_identifier(entry.entry_id, server_id)},
+            name=server_device_name(server),
+            manufacturer=PROPER_NAME,
+            sw_version=server.docker_image,
         )
+        self.entity_description = description
+
+    @property
+    def available(self) -> bool:
+        """Return if the server of this entity has data."""
+        return super().available and self.server_id in self.coordinator.data
+
+    def server_value(self, key: str) -> Any:
+        """Return a value from the data of this entity's server."""
+        return self.coordinator.data[self.server_id].get(key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark last known values that are served while the server fails."""
+        if self.available and self._is_stale():
+            return {"stale": True}
+        return None
+
+    def _state_value(self) -> Any:
+        """Return the server value of this entity."""
+        return self.server_value(self.entity_description.key)
+
+    def _is_stale(self) -> bool:
+        """Return if the data of this entity's server is a last known value."""
+        return bool(self.server_value("stale"))
+
+
+@dataclass(frozen=True, kw_only=True)
+class PterodactylSecondaryEntityDescription(PterodactylEntityDescription):
+    """Describe a Pterodactyl Panel entity of secondary server data."""
+
+    endpoint: str
+
+
+class PterodactylSecondaryEntity(PterodactylEntity):
+    """Base Pterodactyl Panel entity of secondary server data.
+
+    Its endpoint is only fetched while the entity is added, so disabled entities
+    cost no requests.
+    """
+
+    entity_description: PterodactylSecondaryEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PterodactylPanelCoordinator,
+        entry: ConfigEntry,
+        server_id: str,
+        description: PterodactylSecondaryEntityDescription,
+    ) -> None:
+        """Initialize the Pterodactyl Panel secondary data entity."""
+        super().__init__(coordinator, entry, server_id, description)
+        # Secondary data changes on its own schedule, not with the server data.
+        self.coordinator_context = secondary_context(server_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Keep the endpoint of this entity fresh while it is added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.secondary.async_request(
+                self.server_id, self.entity_description.endpoint
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if the endpoint of this entity was fetched."""
+        return super().available and self.secondary_data() is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return no attributes, secondary data is never stale."""
+        return None
+
+    def secondary_data(self) -> dict[str, Any] | None:
+        """Return the cached summary of this entity's endpoint."""
+        return self.coordinator.secondary.get(
+            self.server_id, self.entity_description.endpoint
+        )
+
+    def _state_value(self) -> Any:
+        """Return the summary this entity is derived from."""
+        return self.secondary_data()
+
+
+class PterodactylNodeEntity(_PterodactylCoordinatorEntity):
+    """Base Pterodactyl Panel node entity."""
+
+    def __init__(
+        self,
+        coordinator: PterodactylPanelCoordinator,
+        entry: ConfigEntry,
+        node: str,
+        description: PterodactylEntityDescription,
+    ) -> None:
+        """Initialize the Pterodactyl Panel node entity."""
+        super().__init__(coordinator, context=node_context(node))
+        self.node = node
+        self._attr_unique_id = f"{entry.entry_id}_node_{node}_{description.key}"
         self._attr_device_info = DeviceInfo(
             entry_type=dr.DeviceEntryType.SERVICE,
             configuration_url=coordinator.url,
-            identifiers={
-                (
-                    DOMAIN,
-                    f"{entry.entry_id}_server_{coordinator.server[PTERODACTYL_ID]}",
-                )
-            },
-            name=f"Server {coordinator.server[PTERODACTYL_NAME]}",
+            identifiers={node_device_identifier(entry.entry_id, node)},
+            name=node_device_name(node),
             manufacturer=PROPER_NAME,
-            sw_version=coordinator.server[PTERODACTYL_DOCKER_IMAGE],
         )
         self.entity_description = description
+
+    @property
+    def available(self) -> bool:
+        """Return if the node has servers with data."""
+        return super().available and self.node in self.coordinator.nodes.totals
+
+    def node_value(self, key: str) -> Any:
+        """Return a total or capacity of this entity's node."""
+        return self.coordinator.nodes.value(self.node, key)
+
+    def _state_value(self) -> Any:
+        """Return the node value of this entity."""
+        return self.node_value(self.entity_description.key)
+
+
+class PterodactylPanelEntity(_PterodactylCoordinatorEntity):
+    """Base Pterodactyl Panel entity describing the panel itself."""
+
+    def __init__(
+        self,
+        coordinator: PterodactylPanelCoordinator,
+        entry: ConfigEntry,
+        description: PterodactylEntityDescription,
+    ) -> None:
+        """Initialize the Pterodactyl Panel panel entity."""
+        super().__init__(coordinator, context=PANEL_CONTEXT)
+        self._attr_unique_id = f"{entry.entry_id}_panel_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            entry_type=dr.DeviceEntryType.SERVICE,
+            configuration_url=coordinator.url,
+            identifiers={panel_device_identifier(entry.entry_id)},
+            name=PROPER_NAME,
+            manufacturer=PROPER_NAME,
+        )
+        self.entity_description = description
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics matter most while the panel fails."""
+        return True
@@ -0,0 +1,221 @@
+"""Server events of the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+from .actions import FOLLOW_UP_TIMEOUT
+from .const import (
+    CONF_FAST_MAX_INTERVAL,
+    CONF_RESTART_LOOP_COUNT,
+    CONF_RESTART_LOOP_WINDOW,
+    CONF_SUSTAINED_CPU_THRESHOLD,
+    CONF_SUSTAINED_DURATION,
+    CONF_SUSTAINED_MEMORY_THRESHOLD,
+    DEFAULT_FAST_MAX_INTERVAL,
+    DEFAULT_RESTART_LOOP_COUNT,
+    DEFAULT_RESTART_LOOP_WINDOW,
+    DEFAULT_SUSTAINED_CPU_THRESHOLD,
+    DEFAULT_SUSTAINED_DURATION,
+    DEFAULT_SUSTAINED_MEMORY_THRESHOLD,
+    DOMAIN,
+)
+from .nodes import MEBIBYTE
+from .servers import ServerInfo
+
+EVENT_SERVER_CRASHED: Final = f"{DOMAIN}_server_crashed"
+EVENT_SERVER_UNEXPECTED_STOP: Final = f"{DOMAIN}_server_unexpected_stop"
+EVENT_SERVER_RESTART_LOOP: Final = f"{DOMAIN}_server_restart_loop"
+EVENT_SERVER_SUSTAINED_HIGH_CPU: Final = f"{DOMAIN}_server_sustained_high_cpu"
+EVENT_SERVER_SUSTAINED_HIGH_MEMORY: Final = f"{DOMAIN}_server_sustained_high_memory"
+
+# States a running server only leaves for without a stop when it crashed.
+CRASH_STATES: Final = ("offline", "starting")
+
+
+@dataclass(slots=True)
+class _Threshold:
+    """Track how long a value has been above a threshold."""
+
+    since: float | None = None
+    fired: bool = False
+
+    def observe(self, above: bool, now: float, duration: float) -> bool:
+        """Add a sample and return if the value just stayed high long enough."""
+        if not above:
+            self.since = None
+            self.fired = False
+            return False
+        if self.since is None:
+            self.since = now
+        if self.fired or now - self.since < duration:
+            return False
+        self.fired = True
+        return True
+
+
+@dataclass(slots=True)
+class _ServerWindow:
+    """The recent history of one server."""
+
+    starts: deque[float]
+    sampled: float | None = None
+    state: str | None = None
+    uptime: int | None = None
+    action_sent: float | None = None
+    cpu: _Threshold = field(default_factory=_Threshold)
+    memory: _Threshold = field(default_factory=_Threshold)
+
+
+class ServerEventDetector:
+    """Detect crashes, restart loops and sustained high load from the samples.
+
+    Every server keeps a small window of its recent history: its last state, the
+    times of its last few starts and since when its CPU and memory are high.
+    Each sample is judged against that window in constant time, without any
+    request of its own, and every detected event is reported once:
+
+    - A crash is a running server that went offline or started again without
+      stopping first, while no power action from Home Assistant is pending.
+      A running server whose uptime went down restarted between two samples.
+      Only a server sampled closely, streamed or on the fast polling tier, can
+      be told to have crashed. Between samples further apart the server may as
+      well have been stopped from the panel, so that is only reported as an
+      unexpected stop. Stops from the panel itself can never be told apart
+      from crashes, as the panel doesn't report who stopped a server.
+    - A restart loop is the configured number of starts within the window,
+      counting the restarts between two samples as well.
+    - Sustained high CPU or memory is a value above its threshold in every
+      sample for the configured duration. Memory is judged against the limit
+      of the server, so servers without a limit never report it. Both report
+      again once the value went below the threshold in between.
+    """
+
+    def __init__(self, options: Mapping[str, Any]) -> None:
+        """Initialize the detector from the config entry options."""
+        self._restart_loop_count: int = options.get(
+            CONF_RESTART_LOOP_COUNT, DEFAULT_RESTART_LOOP_COUNT
+        )
+        self._restart_loop_window: int = options.get(
+            CONF_RESTART_LOOP_WINDOW, DEFAULT_RESTART_LOOP_WINDOW
+        )
+        self._cpu_threshold: float = options.get(
+            CONF_SUSTAINED_CPU_THRESHOLD, DEFAULT_SUSTAINED_CPU_THRESHOLD
+        )
+        self._memory_threshold: float = options.get(
+            CONF_SUSTAINED_MEMORY_THRESHOLD, DEFAULT_SUSTAINED_MEMORY_THRESHOLD
+        )
+        self._duration: int = options.get(
+            CONF_SUSTAINED_DURATION, DEFAULT_SUSTAINED_DURATION
+        )
+        # Samples at most this far apart saw the server go down.
+        self._close_gap: int = options.get(
+            CONF_FAST_MAX_INTERVAL, DEFAULT_FAST_MAX_INTERVAL
+        )
+        self._windows: dict[str, _ServerWindow] = {}
+
+    def _window(self, server_id: str) -> _ServerWindow:
+        """Return the window of a server, creating it if needed."""
+        if (window := self._windows.get(server_id)) is None:
+            window = self._windows[server_id] = _ServerWindow(
+                deque(maxlen=self._restart_loop_count)
+            )
+        return window
+
+    def note_power_action(self, server_id: str, now: float) -> None:
+        """Remember that a power action was sent, so it isn't taken for a crash."""
+        self._window(server_id).action_sent = now
+
+    def observe(
+        self,
+        server_id: str,
+        data: Mapping[str, Any],
+        server: ServerInfo | None,
+        now: float,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Add a sample of a server and return the events it completes."""
+        window = self._window(server_id)
+        events: list[tuple[str, dict[str, Any]]] = []
+        state = data["current_state"]
+        uptime = data.get("uptime")
+
+        restarted = (
+            state == window.state == "running"
+            and uptime is not None
+            and window.uptime is not None
+            and uptime < window.uptime
+        )
+        stopped = window.state == "running" and state in CRASH_STATES
+        if (restarted or stopped) and (
+            # Within the follow up of a power action the server just obeyed it.
+            window.action_sent is None
+            or now - window.action_sent > FOLLOW_UP_TIMEOUT
+        ):
+            if restarted or (
+                window.sampled is not None and now - window.sampled <= self._close_gap
+            ):
+                events.append((EVENT_SERVER_CRASHED, {"state": state}))
+            else:
+                events.append((EVENT_SERVER_UNEXPECTED_STOP, {"state": state}))
+
+        if restarted or (state == "starting" and window.state != "starting"):
+            window.starts.append(now)
+            if (
+                len(window.starts) == self._restart_loop_count
+                and now - window.starts[0] <= self._restart_loop_window
+            ):
+                events.append(
+                    (
+                        EVENT_SERVER_RESTART_LOOP,
+                        {
+                            "starts": self._restart_loop_count,
+                            "window": self._restart_loop_window,
+                        },
+                    )
+                )
+                # Every start of the loop is reported once.
+                window.starts.clear()
+        window.sampled = now
+        window.state = state
+        window.uptime = uptime
+
+        running = state == "running"
+        if (cpu := data.get("cpu")) is not None and window.cpu.observe(
+            running and cpu >= self._cpu_threshold, now, self._duration
+        ):
+            events.append(
+                (
+                    EVENT_SERVER_SUSTAINED_HIGH_CPU,
+                    {"cpu": cpu, "threshold": self._cpu_threshold},
+                )
+            )
+
+        memory_limit = server.memory_limit * MEBIBYTE if server is not None else 0
+        if (
+            (memory := data.get("memory")) is not None
+            and memory_limit
+            and window.memory.observe(
+                running and memory >= memory_limit * self._memory_threshold / 100,
+                now,
+                self._duration,
+            )
+        ):
+            events.append(
+                (
+                    EVENT_SERVER_SUSTAINED_HIGH_MEMORY,
+                    {
+                        "memory": memory,
+                        "memory_limit": memory_limit,
+                        "threshold": self._memory_threshold,
+                    },
+                )
+            )
+
+        return events
+
+    def remove(self, server_id: str) -> None:
+        """Forget the window of a server."""
+        self._windows.pop(server_id, None)
@@ -0,0 +1,140 @@
+"""Performance metrics for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+import re
+from typing import Any, Final
+
+# Upper bounds in seconds of the latency histogram buckets, the last is open.
+LATENCY_BUCKETS: Final = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_SERVER_PATH = re.compile(r"/servers/[^/]+")
+
+
+def endpoint_label(method: str, api_path: str, path: str) -> str:
+    """Return the metrics label of a request, without server identifiers."""
+    return f"{method} {api_path}{_SERVER_PATH.sub('/servers/{server}', path)}"
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Count durations into fixed buckets."""
+
+    counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, seconds: float) -> None:
+        """Add a duration to the histogram."""
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    @property
+    def average(self) -> float | None:
+        """Return the average duration, if anything was observed."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for the diagnostics."""
+        bounds = [f"<={bound}" for bound in LATENCY_BUCKETS] + [
+            f">{LATENCY_BUCKETS[-1]}"
+        ]
+        return {
+            "count": self.count,
+            "average": self.average,
+            "buckets": dict(zip(bounds, self.counts, strict=True)),
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Requests, errors and latency of one endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the endpoint metrics for the diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class PanelMetrics:
+    """Collect the api and refresh cycle metrics of a config entry.
+
+    Every request records its endpoint, outcome and latency, along with the time
+    it waited for the request scheduler and for a connection slot. Every refresh
+    cycle records its duration. Recording only updates counters, so it is cheap
+    enough to stay on all the time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.scheduler_wait = LatencyHistogram()
+        self.connection_wait = LatencyHistogram()
+        self.cycles = LatencyHistogram()
+        self.last_cycle_duration: float | None = None
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests sent."""
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests."""
+        return sum(endpoint.errors for endpoint in self.endpoints.values())
+
+    @property
+    def throttled(self) -> int:
+        """Return the number of throttled requests."""
+        return sum(endpoint.throttled for endpoint in self.endpoints.values())
+
+    @property
+    def average_latency(self) -> float | None:
+        """Return the average latency over all endpoints."""
+        count = sum(endpoint.latency.count for endpoint in self.endpoints.values())
+        if not count:
+            return None
+        return (
+            sum(endpoint.latency.total for endpoint in self.endpoints.values()) / count
+        )
+
+    def endpoint(self, label: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint."""
+        if (metrics := self.endpoints.get(label)) is None:
+            metrics = self.endpoints[label] = EndpointMetrics()
+        return metrics
+
+    def record_cycle(self, seconds: float) -> None:
+        """Record the duration of a refresh cycle."""
+        self.cycles.observe(seconds)
+        self.last_cycle_duration = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics for the diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "scheduler_wait": self.scheduler_wait.as_dict(),
+            "connection_wait": self.connection_wait.as_dict(),
+            "cycles": self.cycles.as_dict(),
+            "last_cycle_duration": self.last_cycle_duration,
+            "endpoints": {
+                label: metrics.as_dict()
+                for label, metrics in sorted(self.endpoints.items())
+            },
+        }
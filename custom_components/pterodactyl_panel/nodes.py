@@ -0,0 +1,119 @@
+"""Node aggregates for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Final
+
+from .const import DOMAIN
+from .servers import ServerInfo
+
+MEBIBYTE: Final = 1024 * 1024
+
+# Totals that are summed over the servers of a node.
+SUMMED_KEYS: Final = (
+    "cpu",
+    "memory",
+    "disk",
+    "network_rx",
+    "network_tx",
+    "servers_running",
+    "servers_stopped",
+    "memory_allocated",
+    "disk_allocated",
+)
+
+
+def node_context(node: str) -> tuple[str, str]:
+    """Return the listener context of a node's entities."""
+    return ("node", node)
+
+
+def node_device_identifier(entry_id: str, node: str) -> tuple[str, str]:
+    """Return the device registry identifier of a node."""
+    return (DOMAIN, f"{entry_id}_node_{node}")
+
+
+def node_device_name(node: str) -> str:
+    """Return the device name of a node."""
+    return f"Node {node}"
+
+
+def server_contribution(
+    data: Mapping[str, Any], server_info: ServerInfo | None
+) -> tuple[float, ...]:
+    """Return what a server adds to the totals of its node, in SUMMED_KEYS order."""
+    running = bool(data.get("is_running"))
+    return (
+        data["cpu"],
+        data["memory"],
+        data["disk"],
+        data["network_rx"],
+        data["network_tx"],
+        int(running),
+        int(not running),
+        # Limits are in MiB, 0 means unlimited and adds nothing.
+        (server_info.memory_limit if server_info is not None else 0) * MEBIBYTE,
+        (server_info.disk_limit if server_info is not None else 0) * MEBIBYTE,
+    )
+
+
+class NodeAggregates:
+    """Keep running totals of the servers on each node.
+
+    Every server's last contribution is remembered, so a changed server only
+    subtracts its old values from its node and adds the new ones. Updating the
+    totals costs O(changed servers) instead of a pass over the whole fleet.
+    Contributions are kept as tuples in the order of SUMMED_KEYS, which is far
+    smaller than a dict per server. A node is dropped from the totals with its
+    last server.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty node aggregates."""
+        self.totals: dict[str, dict[str, float]] = {}
+        self.capacity: dict[str, dict[str, float]] = {}
+        self._contributions: dict[str, tuple[str, tuple[float, ...]]] = {}
+
+    def value(self, node: str, key: str) -> float | None:
+        """Return a total or capacity of a node."""
+        if key in SUMMED_KEYS:
+            # Rounded, so repeated additions and subtractions don't show up.
+            return round(self.totals[node][key], 2)
+        return self.capacity.get(node, {}).get(key)
+
+    def update(
+        self, server_id: str, node: str, contribution: tuple[float, ...]
+    ) -> set[str]:
+        """Replace the contribution of a server and return the changed nodes."""
+        if self._contributions.get(server_id) == (node, contribution):
+            return set()
+
+        changed = self.remove(server_id)
+        totals = self.totals.setdefault(node, dict.fromkeys(SUMMED_KEYS, 0))
+        for key, value in zip(SUMMED_KEYS, contribution, strict=True):
+            totals[key] += value
+        self._contributions[server_id] = (node, contribution)
+        changed.add(node)
+        return changed
+
+    def remove(self, server_id: str) -> set[str]:
+        """Drop the contribution of a server and return the changed nodes."""
+        if (previous := self._contributions.pop(server_id, None)) is None:
+            return set()
+
+        node, contribution = previous
+        totals = self.totals[node]
+        for key, value in zip(SUMMED_KEYS, contribution, strict=True):
+            totals[key] -= value
+        # Every server counts as either running or stopped.
+        if totals["servers_running"] + totals["servers_stopped"] <= 0:
+            del self.totals[node]
+        return {node}
+
+    def set_capacity(self, node: str, memory: float | None, disk: float | None) -> None:
+        """Store the memory and disk a node offers, given in MiB."""
+        self.capacity[node] = {
+            "memory_limit": memory * MEBIBYTE if memory else None,
+            "disk_limit": disk * MEBIBYTE if disk else None,
+        }
@@ -0,0 +1,135 @@
+"""Adaptive polling schedule for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Final
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+
+from .const import (
+    CONF_FAST_MAX_INTERVAL,
+    CONF_FAST_MIN_INTERVAL,
+    CONF_HIGH_CPU_THRESHOLD,
+    CONF_OFFLINE_MAX_INTERVAL,
+    CONF_OFFLINE_MIN_INTERVAL,
+    CONF_RUNNING_MAX_INTERVAL,
+    DEFAULT_FAST_MAX_INTERVAL,
+    DEFAULT_FAST_MIN_INTERVAL,
+    DEFAULT_HIGH_CPU_THRESHOLD,
+    DEFAULT_OFFLINE_MAX_INTERVAL,
+    DEFAULT_OFFLINE_MIN_INTERVAL,
+    DEFAULT_RUNNING_MAX_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+)
+
+TIER_FAST: Final = "fast"
+TIER_RUNNING: Final = "running"
+TIER_OFFLINE: Final = "offline"
+
+TRANSITIONAL_STATES: Final = ("starting", "stopping")
+RUNNING_STATE: Final = "running"
+
+# Changes below these deltas count as stable and let the interval back off.
+STABLE_CPU_DELTA: Final = 5
+STABLE_BYTES_RATIO: Final = 0.05
+
+
+def _is_stable(previous: Mapping[str, Any], data: Mapping[str, Any]) -> bool:
+    """Return if the values of a server did not change meaningfully."""
+    if previous["current_state"] != data["current_state"]:
+        return False
+    if abs(data["cpu"] - previous["cpu"]) > STABLE_CPU_DELTA:
+        return False
+    return all(
+        abs(data[key] - previous[key]) <= STABLE_BYTES_RATIO * max(previous[key], 1)
+        for key in ("memory", "disk")
+    )
+
+
+class AdaptivePollSchedule:
+    """Decide when each server's utilization is polled next.
+
+    Servers are polled on the interval of their tier: starting, stopping or busy
+    servers are fast, running servers normal and everything else offline. Each
+    tier starts at its minimum interval and doubles it, up to its maximum, every
+    time a poll finds the server's values stable.
+    """
+
+    def __init__(self, options: Mapping[str, Any]) -> None:
+        """Initialize the schedule from the config entry options."""
+        self._tiers: dict[str, tuple[int, int]] = {
+            TIER_FAST: (
+                options.get(CONF_FAST_MIN_INTERVAL, DEFAULT_FAST_MIN_INTERVAL),
+                options.get(CONF_FAST_MAX_INTERVAL, DEFAULT_FAST_MAX_INTERVAL),
+            ),
+            TIER_RUNNING: (
+                options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                options.get(CONF_RUNNING_MAX_INTERVAL, DEFAULT_RUNNING_MAX_INTERVAL),
+            ),
+            TIER_OFFLINE: (
+                options.get(CONF_OFFLINE_MIN_INTERVAL, DEFAULT_OFFLINE_MIN_INTERVAL),
+                options.get(CONF_OFFLINE_MAX_INTERVAL, DEFAULT_OFFLINE_MAX_INTERVAL),
+            ),
+        }
+        self._high_cpu: float = options.get(
+            CONF_HIGH_CPU_THRESHOLD, DEFAULT_HIGH_CPU_THRESHOLD
+        )
+        self._interval: dict[str, float] = {}
+        self._due: dict[str, float] = {}
+
+    @property
+    def min_interval(self) -> int:
+        """Return the shortest interval of any tier."""
+        return min(min_interval for min_interval, _ in self._tiers.values())
+
+    def tier(self, data: Mapping[str, Any]) -> str:
+        """Return the polling tier of a server."""
+        if (
+            data["current_state"] in TRANSITIONAL_STATES
+            or data["cpu"] >= self._high_cpu
+        ):
+            return TIER_FAST
+        if data["current_state"] == RUNNING_STATE:
+            return TIER_RUNNING
+        return TIER_OFFLINE
+
+    def is_due(self, server_id: str, now: float) -> bool:
+        """Return if a server should be polled now."""
+        return self._due.get(server_id, 0) <= now
+
+    def next_due(self, now: float) -> float | None:
+        """Return the seconds until the next server is due, if any is scheduled."""
+        if not self._due:
+            return None
+        return max(min(self._due.values()) - now, 0)
+
+    def record(
+        self,
+        server_id: str,
+        previous: Mapping[str, Any] | None,
+        data: Mapping[str, Any],
+        now: float,
+    ) -> None:
+        """Schedule the next poll of a server from the values it just returned."""
+        tier = self.tier(data)
+        min_interval, max_interval = self._tiers[tier]
+        interval = self._interval.get(server_id)
+
+        if (
+            interval is None
+            or previous is None
+            or self.tier(previous) != tier
+            or not _is_stable(previous, data)
+        ):
+            interval = min_interval
+        else:
+            interval = min(max(interval * 2, min_interval), max_interval)
+
+        self._interval[server_id] = interval
+        self._due[server_id] = now + interval
+
+    def remove(self, server_id: str) -> None:
+        """Forget the schedule of a server."""
+        self._interval.pop(server_id, None)
+        self._due.pop(server_id, None)
@@ -0,0 +1,145 @@
+"""Per host connection pool of the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import time
+from typing import Any, Final, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import PterodactylApiClient, PterodactylApplicationApiClient, normalize_url
+from .const import DEFAULT_REQUESTS_PER_MINUTE, DOMAIN
+from .scheduler import RequestScheduler
+
+DATA_POOL: Final = "pool"
+
+# Seconds a successful credential check is trusted, so a reload or the setup
+# right after the config flow doesn't ask the panel again.
+VALIDATION_TTL: Final = 300
+
+_ApiT = TypeVar("_ApiT", PterodactylApiClient, PterodactylApplicationApiClient)
+
+
+def _key_digest(api_key: str) -> str:
+    """Return a digest of an api key, so the pool never holds the key itself."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class _PanelHost:
+    """What the config entries of one panel host share."""
+
+    # Keyed by api path, the client and application apis are limited separately.
+    schedulers: dict[str, RequestScheduler] = field(default_factory=dict)
+    # Requests per minute each config entry of the host allows.
+    budgets: dict[str, int] = field(default_factory=dict)
+    # Monotonic time of the last successful check of each api key digest.
+    validated: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def budget(self) -> int:
+        """Return the request budget of the host, the lowest of its entries."""
+        return min(self.budgets.values(), default=DEFAULT_REQUESTS_PER_MINUTE)
+
+
+class PanelConnectionPool:
+    """Share connections, request budgets and credential checks per panel host.
+
+    Config entries and the config flow talking to the same panel share:
+
+    - Home Assistant's http session, whose connector keeps the connections to
+      the panel alive for whichever api key sends the next request.
+    - One request scheduler per api, running at the lowest request budget of
+      the entries, so several api keys together can't overrun the panel.
+    - Recent credential checks, so reloads don't repeat the account request.
+
+    Everything else, like the api key, concurrency limit and metrics, stays
+    with the client of each config entry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty pool."""
+        self._session = async_get_clientsession(hass)
+        self._hosts: dict[str, _PanelHost] = {}
+
+    def _host(self, url: str) -> _PanelHost:
+        """Return the shared state of a panel host."""
+        host = normalize_url(url)
+        if (panel_host := self._hosts.get(host)) is None:
+            panel_host = self._hosts[host] = _PanelHost()
+        return panel_host
+
+    @callback
+    def client(
+        self,
+        client_class: type[_ApiT],
+        url: str,
+        api_key: str,
+        entry_id: str | None = None,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        **options: Any,
+    ) -> _ApiT:
+        """Return a client on the shared session and scheduler of its host.
+
+        The request budget of a config entry counts towards the budget of the
+        host until the entry is released. Clients of the config flow only use
+        the budget the host already has.
+        """
+        panel_host = self._host(url)
+        if entry_id is not None:
+            panel_host.budgets[entry_id] = requests_per_minute
+
+        scheduler = panel_host.schedulers.get(client_class.api_path)
+        if scheduler is None:
+            scheduler = panel_host.schedulers[client_class.api_path] = (
+                RequestScheduler(panel_host.budget)
+            )
+        self._apply_budget(panel_host)
+
+        return client_class(
+            self._session, url, api_key, scheduler=scheduler, **options
+        )
+
+    @callback
+    def release(self, url: str, entry_id: str) -> None:
+        """Stop counting the request budget of an unloaded config entry."""
+        panel_host = self._host(url)
+        panel_host.budgets.pop(entry_id, None)
+        if not panel_host.budgets:
+            # Nothing queues on the schedulers anymore, start afresh next time.
+            panel_host.schedulers.clear()
+            return
+        self._apply_budget(panel_host)
+
+    @staticmethod
+    def _apply_budget(panel_host: _PanelHost) -> None:
+        """Run every scheduler of a host at the budget of the host."""
+        for scheduler in panel_host.schedulers.values():
+            scheduler.set_rate(panel_host.budget)
+
+    def is_validated(self, url: str, api_key: str) -> bool:
+        """Return if an api key was accepted by the panel recently."""
+        checked = self._host(url).validated.get(_key_digest(api_key))
+        return checked is not None and time.monotonic() - checked < VALIDATION_TTL
+
+    @callback
+    def mark_validated(self, url: str, api_key: str) -> None:
+        """Remember that the panel just accepted an api key."""
+        self._host(url).validated[_key_digest(api_key)] = time.monotonic()
+
+    @callback
+    def forget_validation(self, url: str, api_key: str) -> None:
+        """Forget a check of an api key the panel rejected since."""
+        self._host(url).validated.pop(_key_digest(api_key), None)
+
+
+@callback
+def async_get_pool(hass: HomeAssistant) -> PanelConnectionPool:
+    """Return the connection pool of the integration, creating it if needed."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (pool := domain_data.get(DATA_POOL)) is None:
+        pool = domain_data[DATA_POOL] = PanelConnectionPool(hass)
+    return pool
@@ -0,0 +1,74 @@
+"""Network throughput rates for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+import itertools
+from typing import Any, Final, NamedTuple
+
+# Samples kept per server, which bounds the memory whatever the window.
+RATE_SAMPLES: Final = 30
+
+
+class _Sample(NamedTuple):
+    """Cumulative network counters of a server at a point in time."""
+
+    time: float
+    network_rx: int
+    network_tx: int
+    uptime: int
+
+
+class ThroughputRates:
+    """Turn the cumulative network counters of servers into bytes per second.
+
+    Each server keeps a small ring buffer of timestamped counter samples. The
+    rate is taken between the newest sample and the oldest one inside the
+    smoothing window, or the one before it without a window. Counters start over
+    when a container restarts, so a dropping uptime or counter clears the buffer
+    instead of producing a negative rate.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize the rates with a smoothing window in seconds."""
+        self._window = window
+        # Without a window only the last two samples are ever used.
+        self._maxlen = RATE_SAMPLES if window else 2
+        self._samples: dict[str, deque[_Sample]] = {}
+
+    def add(
+        self, server_id: str, now: float, data: Mapping[str, Any]
+    ) -> tuple[float | None, float | None]:
+        """Add the counters of a server and return its receive and send rates."""
+        sample = _Sample(now, data["network_rx"], data["network_tx"], data["uptime"])
+        samples = self._samples.setdefault(server_id, deque(maxlen=self._maxlen))
+
+        if samples and (
+            sample.uptime < samples[-1].uptime
+            or sample.network_rx < samples[-1].network_rx
+            or sample.network_tx < samples[-1].network_tx
+        ):
+            samples.clear()
+        samples.append(sample)
+
+        if len(samples) < 2:
+            return None, None
+
+        base = samples[-2]
+        for older in itertools.islice(samples, len(samples) - 2):
+            if now - older.time <= self._window:
+                base = older
+                break
+
+        elapsed = now - base.time
+        if elapsed <= 0:
+            return None, None
+        return (
+            (sample.network_rx - base.network_rx) / elapsed,
+            (sample.network_tx - base.network_tx) / elapsed,
+        )
+
+    def remove(self, server_id: str) -> None:
+        """Forget the samples of a server."""
+        self._samples.pop(server_id, None)
@@ -0,0 +1,91 @@
+"""Circuit breakers for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+import random
+from typing import Final
+
+STATE_CLOSED: Final = "closed"
+STATE_OPEN: Final = "open"
+STATE_HALF_OPEN: Final = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD: Final = 3
+DEFAULT_BASE_DELAY: Final = 30
+DEFAULT_MAX_DELAY: Final = 600
+
+
+class CircuitBreaker:
+    """Stop sending requests to something that keeps failing.
+
+    After the failure threshold is reached the circuit opens and no requests
+    are allowed until its delay has passed. The delay doubles every time the
+    circuit opens again, up to the maximum, and is jittered so that breakers
+    that opened together do not retry together.
+
+    Once the delay has passed the circuit is half open and allows a single
+    trial request, every other request is still refused. A success closes the
+    circuit, a failure opens it again with a longer delay. A trial that never
+    reports back is allowed again after the base delay, so a lost trial can't
+    keep the circuit half open forever.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        """Initialize a closed circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._trial_sent: float | None = None
+
+    def state(self, now: float) -> str:
+        """Return if the circuit is closed, open or ready for a trial request."""
+        if self.failures < self._failure_threshold:
+            return STATE_CLOSED
+        if now < self._open_until:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def allow(self, now: float) -> bool:
+        """Return if a request may be sent, taking the trial of a half open circuit.
+
+        Callers that get True must record the outcome of their request.
+        """
+        state = self.state(now)
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_OPEN or (
+            self._trial_sent is not None
+            and now - self._trial_sent < self._base_delay
+        ):
+            return False
+        self._trial_sent = now
+        return True
+
+    def retry_in(self, now: float) -> float:
+        """Return the seconds until a request may be sent again."""
+        return max(self._open_until - now, 0)
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._trial_sent = None
+
+    def record_failure(self, now: float) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self.failures += 1
+        if self.failures < self._failure_threshold:
+            return
+
+        delay = min(self._base_delay * 2**self._trips, self._max_delay)
+        self._open_until = now + delay * random.uniform(0.5, 1.5)
+        self._trips += 1
+        self._trial_sent = None
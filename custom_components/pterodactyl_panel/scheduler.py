@@ -0,0 +1,115 @@
+"""Rate limited request scheduling for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Final
+
+# Lower values are sent first.
+PRIORITY_ACTION: Final = 0
+PRIORITY_CONTROL: Final = 1
+PRIORITY_POLL: Final = 2
+# Secondary data only gets what the polls leave of the budget.
+PRIORITY_BACKGROUND: Final = 3
+
+# A small bucket spreads requests out instead of sending them in bursts.
+DEFAULT_BURST: Final = 5
+
+
+class RequestScheduler:
+    """Admit requests according to a token bucket, highest priority first.
+
+    The bucket refills at the configured requests per minute. Requests wait in a
+    priority queue while it is empty, so power actions overtake routine polls.
+    The panel's rate limit headers can shrink the bucket, and a 429 response
+    pauses it until the panel accepts requests again.
+    """
+
+    def __init__(self, requests_per_minute: int, burst: int = DEFAULT_BURST) -> None:
+        """Initialize the request scheduler."""
+        self._rate = requests_per_minute / 60
+        self._capacity = float(max(1, min(burst, requests_per_minute)))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        """Wait until a request with the given priority may be sent."""
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and now >= self._paused_until and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule()
+        await future
+
+    def set_rate(self, requests_per_minute: int, burst: int = DEFAULT_BURST) -> None:
+        """Change the requests per minute, keeping the requests that wait."""
+        now = time.monotonic()
+        self._refill(now)
+        self._rate = requests_per_minute / 60
+        self._capacity = float(max(1, min(burst, requests_per_minute)))
+        self._tokens = min(self._tokens, self._capacity)
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._schedule()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given number of seconds."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._schedule()
+
+    def observe_remaining(self, remaining: int) -> None:
+        """Never spend more tokens than the panel reports to be left."""
+        self._tokens = min(self._tokens, float(remaining))
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _schedule(self) -> None:
+        """Wake up when the first waiting request can be admitted."""
+        if not self._waiters or self._wakeup is not None:
+            return
+
+        now = time.monotonic()
+        self._refill(now)
+        delay = max(
+            self._paused_until - now,
+            (1 - self._tokens) / self._rate,
+            0,
+        )
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests while there are tokens."""
+        self._wakeup = None
+        now = time.monotonic()
+        self._refill(now)
+
+        while self._waiters and now >= self._paused_until and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # The request was cancelled while it waited.
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        self._schedule()
@@ -0,0 +1,310 @@
+"""On-demand secondary server data of the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+import random
+import time
+from typing import Any, Final
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .api import PterodactylApiClient, PterodactylApiError
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# At most this many secondary requests are queued at once, so a large panel
+# doesn't flood the request scheduler when its entities are enabled.
+MAX_CONCURRENT_FETCHES: Final = 4
+
+# Values are evicted once they are this many time to live old, e.g. when the
+# panel keeps rejecting the endpoint.
+MAX_AGE_FACTOR: Final = 3
+
+# Refreshes are spread over this fraction of the time to live.
+REFRESH_JITTER: Final = 0.1
+
+# Failed refreshes are retried after this delay, doubling up to the time to live.
+RETRY_DELAY: Final = 30
+
+ENDPOINT_BACKUPS: Final = "backups"
+ENDPOINT_SCHEDULES: Final = "schedules"
+ENDPOINT_DATABASES: Final = "databases"
+ENDPOINT_ALLOCATIONS: Final = "allocations"
+
+
+def secondary_context(server_id: str) -> tuple[str, str]:
+    """Return the listener context of a server's secondary data entities."""
+    return ("secondary", server_id)
+
+
+def _backups_summary(backups: list[dict[str, Any]]) -> dict[str, Any]:
+    """Count the backups of a server and find the last successful one."""
+    completed = [
+        completed_at
+        for backup in backups
+        if backup.get("is_successful")
+        and (completed_at := dt_util.parse_datetime(backup.get("completed_at") or ""))
+    ]
+    return {
+        "backup_count": len(backups),
+        "last_backup": max(completed, default=None),
+    }
+
+
+def _schedules_summary(schedules: list[dict[str, Any]]) -> dict[str, Any]:
+    """Find the next run of the active schedules of a server."""
+    next_runs = [
+        next_run
+        for schedule in schedules
+        if schedule.get("is_active")
+        and (next_run := dt_util.parse_datetime(schedule.get("next_run_at") or ""))
+    ]
+    return {
+        "schedule_count": len(schedules),
+        "next_schedule_run": min(next_runs, default=None),
+    }
+
+
+def _databases_summary(databases: list[dict[str, Any]]) -> dict[str, Any]:
+    """Count the databases of a server."""
+    return {"database_count": len(databases)}
+
+
+def _allocations_summary(allocations: list[dict[str, Any]]) -> dict[str, Any]:
+    """Find the primary port and every port of a server."""
+    return {
+        "allocation_port": next(
+            (
+                allocation["port"]
+                for allocation in allocations
+                if allocation.get("is_default")
+            ),
+            None,
+        ),
+        "allocation_ports": sorted(allocation["port"] for allocation in allocations),
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class SecondaryEndpoint:
+    """An endpoint of secondary server data and how long its data is fresh."""
+
+    ttl: float
+    fetch_fn: Callable[[PterodactylApiClient, str], Awaitable[list[dict[str, Any]]]]
+    # Only a small summary is kept, never the responses themselves.
+    summary_fn: Callable[[list[dict[str, Any]]], dict[str, Any]]
+
+
+ENDPOINTS: Final[dict[str, SecondaryEndpoint]] = {
+    ENDPOINT_BACKUPS: SecondaryEndpoint(
+        900, PterodactylApiClient.list_backups, _backups_summary
+    ),
+    ENDPOINT_SCHEDULES: SecondaryEndpoint(
+        300, PterodactylApiClient.list_schedules, _schedules_summary
+    ),
+    ENDPOINT_DATABASES: SecondaryEndpoint(
+        3600, PterodactylApiClient.list_databases, _databases_summary
+    ),
+    ENDPOINT_ALLOCATIONS: SecondaryEndpoint(
+        3600, PterodactylApiClient.list_allocations, _allocations_summary
+    ),
+}
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """The cached summary of one endpoint of one server."""
+
+    # Enabled entities that need the entry.
+    demand: int = 0
+    summary: dict[str, Any] | None = None
+    fetched: float | None = None
+    # Monotonic time the entry is refreshed next, 0 as soon as possible.
+    due: float = 0.0
+    fetching: bool = False
+    # Failed refreshes in a row.
+    failures: int = 0
+
+
+class SecondaryDataCache:
+    """Fetch secondary server data only while an enabled entity needs it.
+
+    Backups, schedules, databases and allocations change rarely and would
+    multiply the requests of every refresh cycle, so they are not part of it.
+    Entities request the endpoint they need when they are added and release it
+    when they are removed, so the endpoints of disabled entities are never
+    requested. Every endpoint has its own time to live:
+
+    - Requested entries are refreshed in the background once they expire, with
+      the lowest priority of the request scheduler, so utilization polls always
+      go first. Only a few refreshes are queued at once.
+    - Failed refreshes are retried with an exponential backoff, starting well
+      before the time to live, so a short outage doesn't leave an entity
+      unknown for an hour.
+    - Entries nobody requests anymore are evicted right away, and values that
+      could not be refreshed for several times their time to live are dropped.
+    - Actions that change an endpoint, like starting a backup, invalidate its
+      entry so it is refreshed right away.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: PterodactylApiClient,
+        update_callback: Callable[[str], None],
+    ) -> None:
+        """Initialize an empty cache."""
+        self.hass = hass
+        self._entry = entry
+        self._client = client
+        self._update_callback = update_callback
+        self._entries: dict[tuple[str, str], _CacheEntry] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._next_refresh: float | None = None
+        self._shut_down = False
+
+    def get(self, server_id: str, endpoint: str) -> dict[str, Any] | None:
+        """Return the cached summary of an endpoint of a server, if any."""
+        entry = self._entries.get((server_id, endpoint))
+        return entry.summary if entry is not None else None
+
+    @callback
+    def async_request(self, server_id: str, endpoint: str) -> CALLBACK_TYPE:
+        """Keep an endpoint of a server fresh until the returned callback runs."""
+        key = (server_id, endpoint)
+        if (entry := self._entries.get(key)) is None:
+            entry = self._entries[key] = _CacheEntry()
+        entry.demand += 1
+        self._async_schedule_refresh()
+
+        @callback
+        def async_release() -> None:
+            """Stop keeping the endpoint fresh, evicting it if nobody needs it."""
+            if (entry := self._entries.get(key)) is None:
+                return
+            entry.demand -= 1
+            if entry.demand <= 0:
+                del self._entries[key]
+
+        return async_release
+
+    @callback
+    def async_invalidate(self, server_id: str, endpoint: str) -> None:
+        """Refresh an endpoint of a server as soon as possible."""
+        if (entry := self._entries.get((server_id, endpoint))) is None:
+            return
+        entry.due = 0.0
+        self._async_schedule_refresh()
+
+    @callback
+    def async_remove(self, server_id: str) -> None:
+        """Evict every entry of a server."""
+        for key in [key for key in self._entries if key[0] == server_id]:
+            del self._entries[key]
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop refreshing, the running refreshes end with the config entry."""
+        self._shut_down = True
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+        self._next_refresh = None
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        """Wake up when the next requested entry expires."""
+        if self._shut_down:
+            return
+        due = min(
+            (entry.due for entry in self._entries.values() if not entry.fetching),
+            default=None,
+        )
+        if due is None or (
+            self._next_refresh is not None and self._next_refresh <= due
+        ):
+            return
+
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+        self._next_refresh = due
+        self._unsub_refresh = async_call_later(
+            self.hass, max(due - time.monotonic(), 0), self._async_refresh_due
+        )
+
+    @callback
+    def _async_refresh_due(self, _now: Any = None) -> None:
+        """Start a refresh of every expired entry."""
+        self._unsub_refresh = None
+        self._next_refresh = None
+        now = time.monotonic()
+
+        for key, entry in self._entries.items():
+            if entry.fetching or entry.due > now:
+                continue
+            entry.fetching = True
+            self._entry.async_create_background_task(
+                self.hass,
+                self._async_refresh(key, entry),
+                f"{DOMAIN} secondary {key[1]} {key[0]}",
+            )
+
+        self._async_schedule_refresh()
+
+    async def _async_refresh(self, key: tuple[str, str], entry: _CacheEntry) -> None:
+        """Fetch an entry and notify the entities of its server."""
+        server_id, endpoint_key = key
+        endpoint = ENDPOINTS[endpoint_key]
+        delay = endpoint.ttl
+        try:
+            async with self._semaphore:
+                if self._entries.get(key) is not entry:
+                    # Evicted while it waited.
+                    return
+                items = await endpoint.fetch_fn(self._client, server_id)
+            summary = endpoint.summary_fn(items)
+        except (PterodactylApiError, KeyError, TypeError, ValueError) as err:
+            # Unexpected responses are retried like failed requests.
+            _LOGGER.debug(
+                "Failed to get the %s of %s: %r", endpoint_key, server_id, err
+            )
+            delay = min(RETRY_DELAY * 2**entry.failures, endpoint.ttl)
+            entry.failures += 1
+            if (
+                entry.fetched is not None
+                and time.monotonic() - entry.fetched > endpoint.ttl * MAX_AGE_FACTOR
+                and entry.summary is not None
+            ):
+                entry.summary = None
+                self._update_callback(server_id)
+        else:
+            entry.failures = 0
+            entry.fetched = time.monotonic()
+            if summary != entry.summary:
+                entry.summary = summary
+                self._update_callback(server_id)
+        finally:
+            # Every way out, even a cancelled request, keeps the entry refreshing.
+            entry.fetching = False
+            entry.due = time.monotonic() + delay * random.uniform(
+                1 - REFRESH_JITTER, 1 + REFRESH_JITTER
+            )
+            if self._entries.get(key) is entry:
+                self._async_schedule_refresh()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the entries per endpoint for the diagnostics."""
+        return {
+            endpoint: sum(1 for key in self._entries if key[1] == endpoint)
+            for endpoint in ENDPOINTS
+        }
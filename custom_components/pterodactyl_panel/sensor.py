@@ -1,8 +1,8 @@
 """Sensor for the Pterodactyl Panel."""
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from typing import Final
+from typing import Any, Final
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -11,11 +11,33 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfInformation, UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfDataRate,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .entity import PterodactylEntity, PterodactylEntityDescription
+from .entity import (
+    PterodactylEntity,
+    PterodactylEntityDescription,
+    PterodactylNodeEntity,
+    PterodactylPanelEntity,
+    PterodactylSecondaryEntity,
+    PterodactylSecondaryEntityDescription,
+)
+from .metrics import PanelMetrics
+from .secondary import (
+    ENDPOINT_ALLOCATIONS,
+    ENDPOINT_BACKUPS,
+    ENDPOINT_DATABASES,
+    ENDPOINT_SCHEDULES,
+)
+from .significance import SIGNIFICANCE_BYTES, SIGNIFICANCE_CPU, SIGNIFICANCE_UPTIME
+from .statistics import STATISTICS
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -28,9 +50,28 @@ class PterodactylSensorEntityDescription(
     value_fn: Callable[[str | int | float], str | int | float] = lambda value: value
 
 
+@dataclass(frozen=True, kw_only=True)
+class PterodactylPanelSensorEntityDescription(
+    PterodactylEntityDescription, SensorEntityDescription
+):
+    """Describes Pterodactyl panel diagnostic sensor entity."""
+
+    metric_fn: Callable[[PanelMetrics], int | float | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class PterodactylSecondarySensorEntityDescription(
+    PterodactylSecondaryEntityDescription, SensorEntityDescription
+):
+    """Describes Pterodactyl sensor entity of secondary server data."""
+
+    attributes_fn: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+
+
 SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
     PterodactylSensorEntityDescription(
         key="cpu",
+        significance=SIGNIFICANCE_CPU,
         translation_key="pterodactyl_cpu",
         icon="mdi:cpu-64-bit",
         native_unit_of_measurement=PERCENTAGE,
@@ -44,6 +85,7 @@ SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
     ),
     PterodactylSensorEntityDescription(
         key="disk",
+        significance=SIGNIFICANCE_BYTES,
         icon="mdi:harddisk",
         translation_key="pterodactyl_disk",
         state_class=SensorStateClass.MEASUREMENT,
@@ -54,6 +96,7 @@ SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
     ),
     PterodactylSensorEntityDescription(
         key="memory",
+        significance=SIGNIFICANCE_BYTES,
         icon="mdi:memory",
         translation_key="pterodactyl_memory",
         state_class=SensorStateClass.MEASUREMENT,
@@ -64,6 +107,7 @@ SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
     ),
     PterodactylSensorEntityDescription(
         key="network_rx",
+        significance=SIGNIFICANCE_BYTES,
         icon="mdi:download-network-outline",
         translation_key="pterodactyl_network_rx",
         state_class=SensorStateClass.MEASUREMENT,
@@ -75,6 +119,7 @@ SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
     ),
     PterodactylSensorEntityDescription(
         key="network_tx",
+        significance=SIGNIFICANCE_BYTES,
         icon="mdi:upload-network-outline",
         translation_key="pterodactyl_network_tx",
         state_class=SensorStateClass.MEASUREMENT,
@@ -84,12 +129,35 @@ SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
         suggested_display_precision=2,
         entity_registry_enabled_default=False,
     ),
+    PterodactylSensorEntityDescription(
+        key="network_rx_rate",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:download-network",
+        translation_key="pterodactyl_network_rx_rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
+        suggested_unit_of_measurement=UnitOfDataRate.KILOBYTES_PER_SECOND,
+        suggested_display_precision=1,
+    ),
+    PterodactylSensorEntityDescription(
+        key="network_tx_rate",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:upload-network",
+        translation_key="pterodactyl_network_tx_rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
+        suggested_unit_of_measurement=UnitOfDataRate.KILOBYTES_PER_SECOND,
+        suggested_display_precision=1,
+    ),
     PterodactylSensorEntityDescription(
         key="node",
         translation_key="pterodactyl_node",
     ),
     PterodactylSensorEntityDescription(
         key="uptime",
+        significance=SIGNIFICANCE_UPTIME,
         icon="mdi:memory",
         translation_key="pterodactyl_uptime",
         state_class=SensorStateClass.MEASUREMENT,
@@ -100,6 +168,217 @@ SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
     ),
 ]
 
+# Fetched on demand, so they are disabled by default to cost nothing on large panels.
+SECONDARY_SENSORS: Final[list[PterodactylSecondarySensorEntityDescription]] = [
+    PterodactylSecondarySensorEntityDescription(
+        key="backup_count",
+        endpoint=ENDPOINT_BACKUPS,
+        icon="mdi:backup-restore",
+        translation_key="pterodactyl_backup_count",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    PterodactylSecondarySensorEntityDescription(
+        key="last_backup",
+        endpoint=ENDPOINT_BACKUPS,
+        icon="mdi:backup-restore",
+        translation_key="pterodactyl_last_backup",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=False,
+    ),
+    PterodactylSecondarySensorEntityDescription(
+        key="next_schedule_run",
+        endpoint=ENDPOINT_SCHEDULES,
+        icon="mdi:calendar-clock",
+        translation_key="pterodactyl_next_schedule_run",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=False,
+    ),
+    PterodactylSecondarySensorEntityDescription(
+        key="database_count",
+        endpoint=ENDPOINT_DATABASES,
+        icon="mdi:database",
+        translation_key="pterodactyl_database_count",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    PterodactylSecondarySensorEntityDescription(
+        key="allocation_port",
+        endpoint=ENDPOINT_ALLOCATIONS,
+        icon="mdi:lan-connect",
+        translation_key="pterodactyl_allocation_port",
+        attributes_fn=lambda data: {"ports": data["allocation_ports"]},
+        entity_registry_enabled_default=False,
+    ),
+]
+
+NODE_SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
+    PterodactylSensorEntityDescription(
+        key="cpu",
+        significance=SIGNIFICANCE_CPU,
+        translation_key="pterodactyl_node_cpu",
+        icon="mdi:cpu-64-bit",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    PterodactylSensorEntityDescription(
+        key="memory",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:memory",
+        translation_key="pterodactyl_node_memory",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+    ),
+    PterodactylSensorEntityDescription(
+        key="disk",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:harddisk",
+        translation_key="pterodactyl_node_disk",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+    ),
+    PterodactylSensorEntityDescription(
+        key="network_rx",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:download-network-outline",
+        translation_key="pterodactyl_node_network_rx",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    PterodactylSensorEntityDescription(
+        key="network_tx",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:upload-network-outline",
+        translation_key="pterodactyl_node_network_tx",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    PterodactylSensorEntityDescription(
+        key="servers_running",
+        icon="mdi:server",
+        translation_key="pterodactyl_node_servers_running",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    PterodactylSensorEntityDescription(
+        key="servers_stopped",
+        icon="mdi:server-off",
+        translation_key="pterodactyl_node_servers_stopped",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    PterodactylSensorEntityDescription(
+        key="memory_allocated",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:memory",
+        translation_key="pterodactyl_node_memory_allocated",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+    ),
+    PterodactylSensorEntityDescription(
+        key="disk_allocated",
+        significance=SIGNIFICANCE_BYTES,
+        icon="mdi:harddisk",
+        translation_key="pterodactyl_node_disk_allocated",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+    ),
+]
+
+# The capacity of a node is only known to the application api.
+NODE_CAPACITY_SENSORS: Final[list[PterodactylSensorEntityDescription]] = [
+    PterodactylSensorEntityDescription(
+        key="memory_limit",
+        icon="mdi:memory",
+        translation_key="pterodactyl_node_memory_limit",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+    ),
+    PterodactylSensorEntityDescription(
+        key="disk_limit",
+        icon="mdi:harddisk",
+        translation_key="pterodactyl_node_disk_limit",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        suggested_display_precision=2,
+    ),
+]
+
+PANEL_SENSORS: Final[list[PterodactylPanelSensorEntityDescription]] = [
+    PterodactylPanelSensorEntityDescription(
+        key="api_requests",
+        icon="mdi:api",
+        translation_key="pterodactyl_api_requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_fn=lambda metrics: metrics.requests,
+    ),
+    PterodactylPanelSensorEntityDescription(
+        key="api_errors",
+        icon="mdi:alert-circle-outline",
+        translation_key="pterodactyl_api_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_fn=lambda metrics: metrics.errors,
+    ),
+    PterodactylPanelSensorEntityDescription(
+        key="api_throttled",
+        icon="mdi:speedometer-slow",
+        translation_key="pterodactyl_api_throttled",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_fn=lambda metrics: metrics.throttled,
+    ),
+    PterodactylPanelSensorEntityDescription(
+        key="api_latency",
+        translation_key="pterodactyl_api_latency",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_fn=lambda metrics: metrics.average_latency,
+    ),
+    PterodactylPanelSensorEntityDescription(
+        key="cycle_duration",
+        translation_key="pterodactyl_cycle_duration",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_fn=lambda metrics: metrics.last_cycle_duration,
+    ),
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -107,21 +386,118 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Pterodactyl sensors."""
-    for coordinator in config_entry.runtime_data:
+    coordinator = config_entry.runtime_data
+
+    @callback
+    def _async_add_servers(server_ids: Iterable[str]) -> None:
+        """Add the sensors of the given servers."""
         async_add_entities(
             [
-                PterodactylSensorEntity(coordinator, config_entry, sensor)
+                PterodactylSensorEntity(coordinator, config_entry, server_id, sensor)
+                for server_id in server_ids
                 for sensor in SENSORS
-                if sensor.key in coordinator.data
+            ]
+            + [
+                PterodactylSecondarySensorEntity(
+                    coordinator, config_entry, server_id, sensor
+                )
+                for server_id in server_ids
+                for sensor in SECONDARY_SENSORS
             ]
         )
 
+    _async_add_servers(coordinator.servers)
+    config_entry.async_on_unload(
+        coordinator.async_add_servers_listener(_async_add_servers)
+    )
+
+    node_sensors = NODE_SENSORS
+    if coordinator.application_api is not None:
+        node_sensors = NODE_SENSORS + NODE_CAPACITY_SENSORS
+
+    @callback
+    def _async_add_nodes(nodes: Iterable[str]) -> None:
+        """Add the sensors of the given nodes."""
+        async_add_entities(
+            [
+                PterodactylNodeSensorEntity(coordinator, config_entry, node, sensor)
+                for node in nodes
+                for sensor in node_sensors
+            ]
+        )
+
+    _async_add_nodes(coordinator.nodes.totals)
+    config_entry.async_on_unload(
+        coordinator.async_add_nodes_listener(_async_add_nodes)
+    )
+
+    async_add_entities(
+        PterodactylPanelSensorEntity(coordinator, config_entry, sensor)
+        for sensor in PANEL_SENSORS
+    )
+
 
 class PterodactylSensorEntity(PterodactylEntity, SensorEntity):
     """Represents a Pterodactyl sensor."""
 
+    @property
+    def state_class(self) -> SensorStateClass | str | None:
+        """Leave the statistics to the integration when it imports them."""
+        if (
+            self.coordinator.statistics is not None
+            and self.entity_description.key in STATISTICS
+        ):
+            return None
+        return super().state_class
+
     @property
     def native_value(self) -> str | int | float:
         """Return the state for this sensor."""
-        val = self.coordinator.data.get(self.entity_description.key)
+        val = self.server_value(self.entity_description.key)
         return self.entity_description.value_fn(val)
+
+
+class PterodactylSecondarySensorEntity(PterodactylSecondaryEntity, SensorEntity):
+    """Represents a Pterodactyl sensor of secondary server data."""
+
+    entity_description: PterodactylSecondarySensorEntityDescription
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state for this sensor."""
+        if (data := self.secondary_data()) is None:
+            return None
+        return data[self.entity_description.key]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the attributes of this sensor, if it has any."""
+        if (
+            attributes_fn := self.entity_description.attributes_fn
+        ) is None or (data := self.secondary_data()) is None:
+            return None
+        return attributes_fn(data)
+
+
+class PterodactylNodeSensorEntity(PterodactylNodeEntity, SensorEntity):
+    """Represents a Pterodactyl node sensor."""
+
+    @property
+    def native_value(self) -> int | float | None:
+        """Return the state for this sensor."""
+        return self.node_value(self.entity_description.key)
+
+
+class PterodactylPanelSensorEntity(PterodactylPanelEntity, SensorEntity):
+    """Represents a Pterodactyl panel diagnostic sensor."""
+
+    entity_description: PterodactylPanelSensorEntityDescription
+
+    def _state_value(self) -> int | float | None:
+        """Return the panel metric of this sensor."""
+        return self.entity_description.metric_fn(self.coordinator.metrics)
+
+    @property
+    def native_value(self) -> int | float | None:
+        """Return the state for this sensor."""
+        return self._state_value()
@@ -0,0 +1,308 @@
+"""Services for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any, Final
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .actions import POWER_ACTION_STATES
+from .api import PterodactylApiError
+from .console import MAX_CONSOLE_LINES
+from .const import DOMAIN
+from .coordinator import PterodactylPanelCoordinator, server_device_identifier
+from .nodes import node_device_identifier
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BULK_POWER_ACTION: Final = "bulk_power_action"
+SERVICE_CONSOLE_TAIL: Final = "console_tail"
+
+ATTR_ACTION: Final = "action"
+ATTR_NODE: Final = "node"
+ATTR_NAME_PATTERN: Final = "name_pattern"
+ATTR_PARALLELISM: Final = "parallelism"
+ATTR_STAGGER: Final = "stagger"
+ATTR_WAIT: Final = "wait"
+ATTR_TIMEOUT: Final = "timeout"
+ATTR_LINES: Final = "lines"
+
+RESULT_OK: Final = "ok"
+RESULT_ERROR: Final = "error"
+RESULT_TIMEOUT: Final = "timeout"
+
+SERVICE_BULK_POWER_ACTION_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_ACTION): vol.In(list(POWER_ACTION_STATES)),
+        vol.Optional(ATTR_DEVICE_ID, default=[]): vol.All(
+            cv.ensure_list, [cv.string]
+        ),
+        vol.Optional(ATTR_NODE, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_NAME_PATTERN): cv.is_regex,
+        vol.Optional(ATTR_PARALLELISM, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+        vol.Optional(ATTR_STAGGER, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_WAIT, default=False): cv.boolean,
+        vol.Optional(ATTR_TIMEOUT, default=300): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+SERVICE_CONSOLE_TAIL_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_LINES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_CONSOLE_LINES)
+        ),
+    }
+)
+
+
+def _loaded_coordinators(hass: HomeAssistant) -> list[PterodactylPanelCoordinator]:
+    """Return the coordinators of all loaded config entries."""
+    return [
+        entry.runtime_data
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+@callback
+def _async_resolve_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[tuple[PterodactylPanelCoordinator, str]]:
+    """Return the servers targeted by a device, node or name pattern."""
+    device_ids: list[str] = call.data[ATTR_DEVICE_ID]
+    nodes: list[str] = call.data[ATTR_NODE]
+    name_pattern: re.Pattern[str] | None = call.data.get(ATTR_NAME_PATTERN)
+    if not (device_ids or nodes or name_pattern):
+        raise ServiceValidationError(
+            "Target servers by device, node or name pattern",
+            translation_domain=DOMAIN,
+            translation_key="no_target",
+        )
+
+    if name_pattern is not None:
+        name_pattern = re.compile(name_pattern.pattern, re.IGNORECASE)
+
+    device_registry = dr.async_get(hass)
+    identifiers: set[tuple[str, str]] = set()
+    for device_id in device_ids:
+        if device := device_registry.async_get(device_id):
+            identifiers |= device.identifiers
+
+    targets = []
+    for coordinator in _loaded_coordinators(hass):
+        entry_id = coordinator.config_entry.entry_id
+        for server_id, server in coordinator.servers.items():
+            node = server.node
+            if (
+                server_device_identifier(entry_id, server_id) in identifiers
+                or (node is not None and node in nodes)
+                or (
+                    node is not None
+                    and node_device_identifier(entry_id, node) in identifiers
+                )
+                or (
+                    name_pattern is not None
+                    and name_pattern.search(server.name)
+                )
+            ):
+                targets.append((coordinator, server_id))
+
+    return targets
+
+
+@callback
+def _async_console_tail(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the last console lines of the targeted servers."""
+    device_registry = dr.async_get(hass)
+    identifiers: set[tuple[str, str]] = set()
+    for device_id in call.data[ATTR_DEVICE_ID]:
+        if device := device_registry.async_get(device_id):
+            identifiers |= device.identifiers
+
+    servers = []
+    for coordinator in _loaded_coordinators(hass):
+        if coordinator.console is None:
+            continue
+        entry_id = coordinator.config_entry.entry_id
+        for server_id, server in coordinator.servers.items():
+            if server_device_identifier(
+                entry_id, server_id
+            ) not in identifiers or not coordinator.console.is_subscribed(server_id):
+                continue
+            servers.append(
+                {
+                    "server_id": server_id,
+                    "name": server.name,
+                    "panel": coordinator.url,
+                    "lines": coordinator.console.tail(
+                        server_id, call.data.get(ATTR_LINES)
+                    ),
+                }
+            )
+
+    if not servers:
+        raise ServiceValidationError(
+            "None of the devices is a server whose console is followed",
+            translation_domain=DOMAIN,
+            translation_key="no_console",
+        )
+    return {"servers": servers}
+
+
+async def _async_wait_for_state(
+    coordinator: PterodactylPanelCoordinator,
+    server_id: str,
+    action: str,
+    timeout: float,
+) -> bool:
+    """Wait until a server settles in the state of a power action."""
+    target_state = POWER_ACTION_STATES[action]
+    # A restart has to leave the running state before it counts as done.
+    left_target = action != "restart"
+    settled = asyncio.Event()
+
+    @callback
+    def _async_check_state() -> None:
+        """Check the state of the server after an update."""
+        nonlocal left_target
+        if coordinator.data is None or server_id not in coordinator.data:
+            return
+        state = coordinator.data[server_id].current_state
+        if state != target_state:
+            left_target = True
+        elif left_target:
+            settled.set()
+
+    remove_listener = coordinator.async_add_listener(
+        _async_check_state, context=server_id
+    )
+    try:
+        _async_check_state()
+        async with asyncio.timeout(timeout):
+            await settled.wait()
+    except TimeoutError:
+        return False
+    finally:
+        remove_listener()
+    return True
+
+
+class _BulkPowerAction:
+    """Send a power action to many servers with bounded parallelism.
+
+    At most the given number of servers are handled at once, and consecutive
+    actions start at least the stagger apart. Every server gets its own result,
+    a failing server never stops the others.
+    """
+
+    def __init__(self, call: ServiceCall) -> None:
+        """Initialize the bulk power action from the service call."""
+        self._action: str = call.data[ATTR_ACTION]
+        self._stagger: float = call.data[ATTR_STAGGER]
+        self._wait: bool = call.data[ATTR_WAIT]
+        self._timeout: float = call.data[ATTR_TIMEOUT]
+        self._semaphore = asyncio.Semaphore(call.data[ATTR_PARALLELISM])
+        self._start_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def async_run(
+        self, targets: list[tuple[PterodactylPanelCoordinator, str]]
+    ) -> list[dict[str, Any]]:
+        """Run the action on every target and return the result of each server."""
+        return await asyncio.gather(
+            *(
+                self._async_run_server(coordinator, server_id)
+                for coordinator, server_id in targets
+            )
+        )
+
+    async def _async_run_server(
+        self, coordinator: PterodactylPanelCoordinator, server_id: str
+    ) -> dict[str, Any]:
+        """Run the action on a single server and return its result."""
+        result: dict[str, Any] = {
+            "server_id": server_id,
+            "name": coordinator.servers[server_id].name,
+            "panel": coordinator.url,
+        }
+
+        async with self._semaphore:
+            await self._async_wait_for_turn()
+            try:
+                await coordinator.send_power_action(server_id, self._action)
+            except PterodactylApiError as err:
+                _LOGGER.debug("Failed to %s %s: %s", self._action, server_id, err)
+                result.update(result=RESULT_ERROR, error=str(err))
+                return result
+
+            result["result"] = RESULT_OK
+            if self._wait and not await _async_wait_for_state(
+                coordinator, server_id, self._action, self._timeout
+            ):
+                result["result"] = RESULT_TIMEOUT
+
+        if coordinator.data is not None and server_id in coordinator.data:
+            result["current_state"] = coordinator.data[server_id].current_state
+        return result
+
+    async def _async_wait_for_turn(self) -> None:
+        """Keep consecutive actions at least the stagger apart."""
+        async with self._start_lock:
+            loop = asyncio.get_running_loop()
+            if (delay := self._next_start - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            self._next_start = loop.time() + self._stagger
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Pterodactyl Panel services."""
+
+    async def async_bulk_power_action(call: ServiceCall) -> ServiceResponse:
+        """Send a power action to every targeted server."""
+        targets = _async_resolve_targets(hass, call)
+        results = await _BulkPowerAction(call).async_run(targets)
+        return {"servers": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_POWER_ACTION,
+        async_bulk_power_action,
+        schema=SERVICE_BULK_POWER_ACTION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    @callback
+    def async_console_tail(call: ServiceCall) -> ServiceResponse:
+        """Return the last console lines of every targeted server."""
+        return _async_console_tail(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CONSOLE_TAIL,
+        async_console_tail,
+        schema=SERVICE_CONSOLE_TAIL_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
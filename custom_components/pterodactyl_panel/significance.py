@@ -0,0 +1,62 @@
+"""Significant state changes for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Final
+
+from .const import (
+    CONF_BYTES_DEADBAND,
+    CONF_CPU_DEADBAND,
+    CONF_MAX_SILENCE,
+    CONF_UPTIME_GRANULARITY,
+    DEFAULT_BYTES_DEADBAND,
+    DEFAULT_CPU_DEADBAND,
+    DEFAULT_MAX_SILENCE,
+    DEFAULT_UPTIME_GRANULARITY,
+)
+
+SIGNIFICANCE_CPU: Final = "cpu"
+SIGNIFICANCE_BYTES: Final = "bytes"
+SIGNIFICANCE_UPTIME: Final = "uptime"
+
+
+class SignificanceFilter:
+    """Decide if a new value is worth a state write.
+
+    CPU values have an absolute deadband in percentage points, byte values a
+    deadband relative to the last written value and uptimes a coarse granularity.
+    A dropping uptime is always written, since it means the server restarted. Any
+    change is written once the last write is older than the maximum silence, so
+    history keeps following the server.
+    """
+
+    def __init__(self, options: Mapping[str, Any]) -> None:
+        """Initialize the filter from the config entry options."""
+        self._cpu_deadband: float = options.get(CONF_CPU_DEADBAND, DEFAULT_CPU_DEADBAND)
+        self._bytes_ratio: float = (
+            options.get(CONF_BYTES_DEADBAND, DEFAULT_BYTES_DEADBAND) / 100
+        )
+        # Uptimes are in milliseconds.
+        self._uptime_granularity: float = (
+            options.get(CONF_UPTIME_GRANULARITY, DEFAULT_UPTIME_GRANULARITY) * 1000
+        )
+        self._max_silence: float = options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE)
+
+    def is_significant(
+        self, significance: str, previous: Any, value: Any, silence: float
+    ) -> bool:
+        """Return if a value should be written after the given seconds of silence."""
+        if previous == value:
+            return False
+        if previous is None or value is None or silence >= self._max_silence:
+            return True
+
+        delta = abs(value - previous)
+        if significance == SIGNIFICANCE_CPU:
+            return delta > self._cpu_deadband
+        if significance == SIGNIFICANCE_BYTES:
+            return delta > self._bytes_ratio * abs(previous)
+        if significance == SIGNIFICANCE_UPTIME:
+            return value < previous or delta >= self._uptime_granularity
+        return True
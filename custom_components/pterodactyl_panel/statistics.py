@@ -0,0 +1,181 @@
+"""Hourly long-term statistics of the Pterodactyl Panel integration.
+
+Only hourly buckets are kept. External statistics can only be imported for
+whole hours: the recorder rejects imported rows that don't start at the top of
+an hour, and its 5-minute short-term statistics can't be imported at all.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Final
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.const import PERCENTAGE, UnitOfDataRate, UnitOfInformation
+from homeassistant.util.unit_conversion import DataRateConverter, InformationConverter
+
+from .const import DOMAIN
+from .servers import ServerInfo
+
+HOUR: Final = timedelta(hours=1)
+
+# Values are held until the next sample, but not across a longer gap in the data.
+MAX_GAP: Final = HOUR
+
+# Name, unit and unit class of the statistics of every server.
+STATISTICS: Final[dict[str, tuple[str, str, str | None]]] = {
+    "cpu": ("CPU usage", PERCENTAGE, None),
+    "memory": (
+        "Memory usage",
+        UnitOfInformation.BYTES,
+        InformationConverter.UNIT_CLASS,
+    ),
+    "disk": (
+        "Disk usage",
+        UnitOfInformation.BYTES,
+        InformationConverter.UNIT_CLASS,
+    ),
+    "network_rx_rate": (
+        "Network download rate",
+        UnitOfDataRate.BYTES_PER_SECOND,
+        DataRateConverter.UNIT_CLASS,
+    ),
+    "network_tx_rate": (
+        "Network upload rate",
+        UnitOfDataRate.BYTES_PER_SECOND,
+        DataRateConverter.UNIT_CLASS,
+    ),
+}
+
+
+def statistic_id(entry_id: str, server_id: str, key: str) -> str:
+    """Return the external statistic id of a server value."""
+    return f"{DOMAIN}:{entry_id.lower()}_{server_id.lower()}_{key}"
+
+
+def statistic_metadata(
+    entry_id: str, server: ServerInfo, key: str
+) -> StatisticMetaData:
+    """Return the metadata of the external statistic of a server value."""
+    name, unit, unit_class = STATISTICS[key]
+    return StatisticMetaData(
+        mean_type=StatisticMeanType.ARITHMETIC,
+        has_sum=False,
+        name=f"{server.name} {name}",
+        source=DOMAIN,
+        statistic_id=statistic_id(entry_id, server.identifier, key),
+        unit_class=unit_class,
+        unit_of_measurement=unit,
+    )
+
+
+def _hour_start(moment: datetime) -> datetime:
+    """Return the start of the hour of a moment."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """The values of one series within one hour."""
+
+    start: datetime
+    min: float
+    max: float
+    weighted: float = 0.0
+    duration: float = 0.0
+
+    def hold(self, value: float, seconds: float) -> None:
+        """Count a value that lasted for the given seconds."""
+        self.weighted += value * seconds
+        self.duration += seconds
+
+    def add(self, value: float) -> None:
+        """Count a new value towards the minimum and maximum."""
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def statistic(self) -> StatisticData:
+        """Return the statistics of the hour."""
+        return StatisticData(
+            start=self.start,
+            mean=self.weighted / self.duration if self.duration else self.min,
+            min=self.min,
+            max=self.max,
+        )
+
+
+@dataclass(slots=True)
+class _Series:
+    """The latest value of a series and its open bucket."""
+
+    value: float
+    since: datetime
+    bucket: _Bucket
+
+
+class HourlyStatistics:
+    """Aggregate server values into hourly minimum, maximum and mean.
+
+    Every value lasts until the next sample, so the mean is weighted by time
+    however irregular the polls are. Only the open hour of every series is
+    kept, completed hours are handed out once, ready to be imported as external
+    statistics, and forgotten.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without any series."""
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._completed: dict[tuple[str, str], list[StatisticData]] = {}
+
+    def add(self, server_id: str, data: Mapping[str, Any], now: datetime) -> None:
+        """Add the current values of a server."""
+        for key in STATISTICS:
+            if (value := data.get(key)) is not None:
+                self._add((server_id, key), float(value), now)
+
+    def _add(self, series_key: tuple[str, str], value: float, now: datetime) -> None:
+        """Add a value to a series, completing the hours that passed."""
+        series = self._series.get(series_key)
+        if series is not None and now - series.since > MAX_GAP:
+            # Don't make up values for a gap, complete what was seen and start over.
+            self._complete(series_key, series.bucket)
+            series = None
+
+        if series is None:
+            self._series[series_key] = _Series(
+                value, now, _Bucket(_hour_start(now), value, value)
+            )
+            return
+
+        while (end := series.bucket.start + HOUR) <= now:
+            series.bucket.hold(series.value, (end - series.since).total_seconds())
+            self._complete(series_key, series.bucket)
+            series.since = end
+            series.bucket = _Bucket(end, series.value, series.value)
+
+        series.bucket.hold(series.value, (now - series.since).total_seconds())
+        series.bucket.add(value)
+        series.since = now
+        series.value = value
+
+    def _complete(self, series_key: tuple[str, str], bucket: _Bucket) -> None:
+        """Queue the statistics of a completed hour."""
+        self._completed.setdefault(series_key, []).append(bucket.statistic())
+
+    def pop_completed(self) -> dict[tuple[str, str], list[StatisticData]]:
+        """Return the completed hours of every series and forget them."""
+        completed, self._completed = self._completed, {}
+        return completed
+
+    def remove(self, server_id: str) -> None:
+        """Forget the series of a server."""
+        for series_key in [key for key in self._series if key[0] == server_id]:
+            del self._series[series_key]
+        for series_key in [key for key in self._completed if key[0] == server_id]:
+            del self._completed[series_key]
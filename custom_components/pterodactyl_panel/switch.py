@@ -1,12 +1,14 @@
 """Switch for the Pterodactyl Panel."""
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .actions import POWER_ACTION_STATES
 from .entity import PterodactylEntity, PterodactylEntityDescription
 
 
@@ -23,21 +25,32 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Pterodactyl Panel switches."""
-    for coordinator in config_entry.runtime_data:
+    coordinator = config_entry.runtime_data
+
+    @callback
+    def _async_add_servers(server_ids: Iterable[str]) -> None:
+        """Add the power switches of the given servers."""
         async_add_entities(
             [
                 PterodactylPowerSwitchEntity(
                     coordinator,
                     config_entry,
+                    server_id,
                     PterodactylSwitchEntityDescription(
                         key="power_switch",
                         translation_key="pterodactyl_server_power_switch",
                         icon="mdi:power",
                     )
-                ),
+                )
+                for server_id in server_ids
             ]
         )
 
+    _async_add_servers(coordinator.servers)
+    config_entry.async_on_unload(
+        coordinator.async_add_servers_listener(_async_add_servers)
+    )
+
 
 class PterodactylPowerSwitchEntity(PterodactylEntity, SwitchEntity):
     """Represents a Pterodactyl Panel switch."""
@@ -45,12 +58,15 @@ class PterodactylPowerSwitchEntity(PterodactylEntity, SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return true if the switch is on."""
-        return self.coordinator.data.get('is_running')
+        # Show the outcome of a pending power action until it settles.
+        if pending := self.coordinator.power_actions.get(self.server_id):
+            return POWER_ACTION_STATES[pending.action] == "running"
+        return self.server_value('is_running')
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        await self.coordinator.send_power_action('start')
+        await self.coordinator.send_power_action(self.server_id, 'start')
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        await self.coordinator.send_power_action('stop')
+        await self.coordinator.send_power_action(self.server_id, 'stop')
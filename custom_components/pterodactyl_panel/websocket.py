@@ -0,0 +1,163 @@
+"""Websocket live stats for the Pterodactyl Panel integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+import random
+from typing import Any, Final
+
+from aiohttp import ClientError, WSMsgType
+
+from .api import PterodactylApiClient, PterodactylApiError
+
+_LOGGER = logging.getLogger(__name__)
+
+WEBSOCKET_HEARTBEAT: Final = 30
+WEBSOCKET_MIN_BACKOFF: Final = 5
+WEBSOCKET_MAX_BACKOFF: Final = 300
+
+EVENT_AUTH: Final = "auth"
+EVENT_AUTH_SUCCESS: Final = "auth success"
+EVENT_SEND_STATS: Final = "send stats"
+EVENT_STATS: Final = "stats"
+EVENT_STATUS: Final = "status"
+EVENT_CONSOLE_OUTPUT: Final = "console output"
+EVENT_TOKEN_EXPIRING: Final = "token expiring"
+EVENT_TOKEN_EXPIRED: Final = "token expired"
+EVENT_JWT_ERROR: Final = "jwt error"
+
+
+def parse_stats(stats: dict[str, Any]) -> dict[str, Any]:
+    """Map a websocket stats payload onto the coordinator data keys."""
+    return {
+        "current_state": stats["state"],
+        "memory": stats["memory_bytes"],
+        "cpu": stats["cpu_absolute"],
+        "disk": stats["disk_bytes"],
+        "network_tx": stats["network"]["tx_bytes"],
+        "network_rx": stats["network"]["rx_bytes"],
+        "uptime": stats["uptime"],
+    }
+
+
+class PterodactylServerWebsocket:
+    """Keep a websocket connection to a server and push its stats or console.
+
+    The connection is authenticated with a short lived token from the panel,
+    which is renewed when Wings reports it is expiring. Lost connections are
+    retried with an exponential, jittered backoff.
+
+    Stats are only pushed with an update callback and console output only with
+    a console callback, a connection may carry either or both.
+    """
+
+    def __init__(
+        self,
+        client: PterodactylApiClient,
+        server_id: str,
+        update_callback: Callable[[str, dict[str, Any]], None] | None,
+        connection_callback: Callable[[str, bool], None],
+        console_callback: Callable[[str, str], None] | None = None,
+    ) -> None:
+        """Initialize the server websocket."""
+        self._client = client
+        self.server_id = server_id
+        self._update_callback = update_callback
+        self._connection_callback = connection_callback
+        self._console_callback = console_callback
+        self.connected = False
+
+    @property
+    def streams_stats(self) -> bool:
+        """Return if this connection pushes the stats of its server."""
+        return self._update_callback is not None
+
+    async def async_run(self) -> None:
+        """Stream stats until cancelled, reconnecting when the connection drops."""
+        backoff = WEBSOCKET_MIN_BACKOFF
+
+        while True:
+            try:
+                await self._async_stream()
+            except (PterodactylApiError, ClientError, TimeoutError) as err:
+                _LOGGER.debug("Websocket of %s failed: %s", self.server_id, err)
+            except Exception:
+                # Never let the task die, the server would silently stay marked
+                # as streaming and its polls would stop.
+                _LOGGER.exception(
+                    "Unexpected error in the websocket of %s", self.server_id
+                )
+            else:
+                _LOGGER.debug("Websocket of %s closed", self.server_id)
+
+            # Start over with a short delay if the last connection was usable.
+            if self.connected:
+                backoff = WEBSOCKET_MIN_BACKOFF
+            self._set_connected(False)
+
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+            backoff = min(backoff * 2, WEBSOCKET_MAX_BACKOFF)
+
+    async def _async_stream(self) -> None:
+        """Connect, authenticate and handle events until the socket closes."""
+        credentials = await self._client.get_websocket(self.server_id)
+
+        async with self._client.session.ws_connect(
+            credentials["socket"],
+            headers={"Origin": self._client.url},
+            heartbeat=WEBSOCKET_HEARTBEAT,
+        ) as websocket:
+            await websocket.send_json(
+                {"event": EVENT_AUTH, "args": [credentials["token"]]}
+            )
+
+            async for message in websocket:
+                if message.type is not WSMsgType.TEXT:
+                    break
+
+                try:
+                    payload = json.loads(message.data)
+                    event = payload.get("event")
+                    args = payload.get("args") or [None]
+                    if event == EVENT_STATS and self._update_callback is not None:
+                        stats = parse_stats(json.loads(args[0]))
+                except (AttributeError, KeyError, TypeError, ValueError) as err:
+                    # One malformed message doesn't end a usable connection.
+                    _LOGGER.debug(
+                        "Skipped a malformed message of %s: %r", self.server_id, err
+                    )
+                    continue
+
+                if event == EVENT_AUTH_SUCCESS:
+                    self._set_connected(True)
+                    if self._update_callback is not None:
+                        await websocket.send_json(
+                            {"event": EVENT_SEND_STATS, "args": [None]}
+                        )
+                elif event == EVENT_STATS and self._update_callback is not None:
+                    self._update_callback(self.server_id, stats)
+                elif event == EVENT_STATUS and self._update_callback is not None:
+                    self._update_callback(self.server_id, {"current_state": args[0]})
+                elif (
+                    event == EVENT_CONSOLE_OUTPUT
+                    and self._console_callback is not None
+                    and args[0]
+                ):
+                    self._console_callback(self.server_id, args[0])
+                elif event == EVENT_TOKEN_EXPIRING:
+                    credentials = await self._client.get_websocket(self.server_id)
+                    await websocket.send_json(
+                        {"event": EVENT_AUTH, "args": [credentials["token"]]}
+                    )
+                elif event in (EVENT_TOKEN_EXPIRED, EVENT_JWT_ERROR):
+                    _LOGGER.debug("Websocket of %s rejected: %s", self.server_id, event)
+                    break
+
+    def _set_connected(self, connected: bool) -> None:
+        """Store the connection state and report changes."""
+        if connected != self.connected:
+            self.connected = connected
+            self._connection_callback(self.server_id, connected)
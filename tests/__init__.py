@@ -0,0 +1 @@
+"""Tests of the Pterodactyl Panel integration."""
@@ -0,0 +1,67 @@
+"""Fixtures of the Pterodactyl Panel tests."""
+
+from __future__ import annotations
+
+from typing import Any, Final
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pterodactyl_panel.api import PterodactylApiClient
+from custom_components.pterodactyl_panel.const import DOMAIN
+
+URL: Final = "https://panel.example"
+API_KEY: Final = "ptlc_test"
+
+
+def server_attributes(identifier: str) -> dict[str, Any]:
+    """Return a server in the shape of the client api listing."""
+    return {
+        "identifier": identifier,
+        "name": f"Server {identifier}",
+        "docker_image": "ghcr.io/pterodactyl/yolks:java_17",
+        "node": "node-1",
+        "is_node_under_maintenance": False,
+        "limits": {"memory": 1024, "disk": 4096},
+    }
+
+
+def utilization(state: str = "running") -> dict[str, Any]:
+    """Return a utilization response of the client api."""
+    return {
+        "current_state": state,
+        "resources": {
+            "memory_bytes": 512 * 1024 * 1024,
+            "cpu_absolute": 12.5,
+            "disk_bytes": 1024 * 1024 * 1024,
+            "network_rx_bytes": 1000,
+            "network_tx_bytes": 2000,
+            "uptime": 60000,
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Let the test instance load the integration from custom_components."""
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a config entry of the panel, added to Home Assistant."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: URL, CONF_API_KEY: API_KEY}
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+def client() -> PterodactylApiClient:
+    """Return a client api client whose requests are mocked."""
+    api = PterodactylApiClient(MagicMock(), URL, API_KEY)
+    api._request = AsyncMock()
+    return api
@@ -0,0 +1,49 @@
+"""Tests of the Pterodactyl Panel coordinator."""
+
+from __future__ import annotations
+
+import time
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pterodactyl_panel.api import (
+    PterodactylApiClient,
+    PterodactylConnectionError,
+)
+from custom_components.pterodactyl_panel.coordinator import (
+    PterodactylPanelCoordinator,
+    _utilization_data,
+)
+from custom_components.pterodactyl_panel.resilience import STATE_OPEN
+from custom_components.pterodactyl_panel.servers import ServerData
+
+from .conftest import server_attributes, utilization
+
+
+async def test_panel_breaker_opens_while_idle_servers_send_nothing(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    client: PterodactylApiClient,
+) -> None:
+    """Servers that are not due don't count as successes of a failing panel."""
+    coordinator = PterodactylPanelCoordinator(hass, client, config_entry)
+    coordinator.async_update_servers(
+        [server_attributes("due"), server_attributes("idle")]
+    )
+    values = _utilization_data(utilization())
+    coordinator.data = {
+        "due": ServerData.from_dict(values),
+        "idle": ServerData.from_dict(values),
+    }
+    # The idle server was just polled, so only the due server sends a request.
+    coordinator._poll_schedule.record("idle", None, values, time.monotonic())
+    client._request.side_effect = PterodactylConnectionError("Panel is down")
+
+    for _ in range(2):
+        await coordinator._async_fetch_servers(["due", "idle"])
+
+    assert coordinator.panel_breaker.state(time.monotonic()) == STATE_OPEN
+    requested = {call.args[1] for call in client._request.await_args_list}
+    assert requested == {"/servers/due/resources"}
+    assert coordinator.server_breakers["idle"].failures == 0
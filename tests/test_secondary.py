@@ -0,0 +1,54 @@
+"""Tests of the on-demand secondary server data."""
+
+from __future__ import annotations
+
+import time
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pterodactyl_panel.api import (
+    PterodactylApiClient,
+    PterodactylConnectionError,
+)
+from custom_components.pterodactyl_panel.secondary import (
+    ENDPOINT_DATABASES,
+    ENDPOINTS,
+    REFRESH_JITTER,
+    RETRY_DELAY,
+    SecondaryDataCache,
+)
+
+
+async def test_failed_refresh_is_retried_soon(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    client: PterodactylApiClient,
+) -> None:
+    """A failed first fetch is retried long before the time to live."""
+    updated: list[str] = []
+    cache = SecondaryDataCache(hass, config_entry, client, updated.append)
+    release = cache.async_request("abc", ENDPOINT_DATABASES)
+    entry = cache._entries[("abc", ENDPOINT_DATABASES)]
+    # Refreshed by hand, not by the timer of the cache.
+    entry.fetching = True
+    client._request.side_effect = [
+        PterodactylConnectionError("Panel is down"),
+        {"data": [{"object": "database", "attributes": {"name": "s1_db"}}]},
+    ]
+
+    await cache._async_refresh(("abc", ENDPOINT_DATABASES), entry)
+
+    assert cache.get("abc", ENDPOINT_DATABASES) is None
+    assert entry.due - time.monotonic() <= RETRY_DELAY * (1 + REFRESH_JITTER)
+
+    entry.fetching = True
+    await cache._async_refresh(("abc", ENDPOINT_DATABASES), entry)
+
+    assert cache.get("abc", ENDPOINT_DATABASES) == {"database_count": 1}
+    assert updated == ["abc"]
+    ttl = ENDPOINTS[ENDPOINT_DATABASES].ttl
+    assert entry.due - time.monotonic() >= ttl * (1 - REFRESH_JITTER) - 1
+
+    release()
+    cache.async_shutdown()